@@ -0,0 +1,192 @@
+"""
+Reusable Excel COM instances.
+
+Starting Excel through COM takes seconds (much longer on the VDI), so tools
+should not DispatchEx/Quit around every conversion or pivot. ExcelPool hands
+out hidden Excel instances for the duration of one operation:
+
+    with pool.operation("pivot", path.name) as excel:
+        workbook = excel.Workbooks.Open(str(path))
+        ...
+
+Instances are started lazily (never, if no COM step runs), at most `size` at a
+time, checked before each reuse and replaced once they have served `max_ops`
+operations or when an operation raises (a COM error can leave Excel hung or
+with workbooks open). Each operation's time is logged and close() prints a
+summary. Pools are closed at process exit, including pool worker processes.
+
+Windows with pywin32 only. Used by payment-list.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from multiprocessing import util as mp_util
+from typing import Callable, Iterator
+
+DEFAULT_MAX_OPS = 25
+
+
+def start_excel():
+    """Start a hidden Excel instance through COM."""
+    import win32com.client as win32
+
+    excel = win32.DispatchEx("Excel.Application")
+    excel.Visible = False
+    excel.DisplayAlerts = False
+    return excel
+
+
+def excel_is_healthy(excel) -> bool:
+    """True when the instance still answers COM calls and has no workbooks left open."""
+    try:
+        return excel.Workbooks.Count == 0
+    except Exception:
+        return False
+
+
+def quit_excel(excel) -> None:
+    try:
+        excel.Quit()
+    except Exception as exc:  # pragma: no cover - Excel already gone
+        print(f"[WARN] Excel did not quit cleanly: {exc}")
+
+
+@dataclass
+class PooledExcel:
+    app: object
+    ops: int = 0
+
+
+@dataclass
+class PoolStats:
+    starts: int = 0
+    start_seconds: float = 0.0
+    recycled: int = 0
+    failures: int = 0
+    op_seconds: dict[str, float] = field(default_factory=dict)
+    op_counts: dict[str, int] = field(default_factory=dict)
+
+    def record(self, kind: str, elapsed: float) -> None:
+        self.op_seconds[kind] = self.op_seconds.get(kind, 0.0) + elapsed
+        self.op_counts[kind] = self.op_counts.get(kind, 0) + 1
+
+
+class ExcelPool:
+    """Bounded, lazily started pool of reusable Excel instances."""
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_ops: int = DEFAULT_MAX_OPS,
+        factory: Callable[[], object] = start_excel,
+    ) -> None:
+        self.size = max(1, size)
+        self.max_ops = max(1, max_ops)
+        self.factory = factory
+        self.stats = PoolStats()
+        self._idle: list[PooledExcel] = []
+        self._live = 0
+        self._cond = threading.Condition()
+        self._finalizer = None
+
+    def __enter__(self) -> ExcelPool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def operation(self, kind: str, name: str = "") -> Iterator[object]:
+        """Lend an Excel instance for one operation; timings are logged and totalled by kind."""
+        label = f"{kind} {name}".strip()
+        instance = self._acquire()
+        start = time.perf_counter()
+        try:
+            yield instance.app
+        except Exception:
+            elapsed = time.perf_counter() - start
+            self.stats.failures += 1
+            print(f"[WARN] Excel {label} failed after {elapsed:.2f}s; restarting Excel for the next operation")
+            self._retire(instance)
+            raise
+        elapsed = time.perf_counter() - start
+        self.stats.record(kind, elapsed)
+        instance.ops += 1
+        print(f"[INFO] Excel {label}: {elapsed:.2f}s")
+        if instance.ops >= self.max_ops:
+            self.stats.recycled += 1
+            self._retire(instance)
+        else:
+            self._release(instance)
+
+    def close(self) -> None:
+        """Quit every idle instance and print the pool summary."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+        for instance in idle:
+            quit_excel(instance.app)
+        if self.stats.starts:
+            print(self.summary())
+            self.stats = PoolStats()
+
+    def summary(self) -> str:
+        stats = self.stats
+        ops = ", ".join(
+            f"{kind} {stats.op_counts[kind]}x {seconds:.1f}s"
+            for kind, seconds in stats.op_seconds.items()
+        )
+        return (
+            f"[INFO] Excel pool: {stats.starts} start(s) in {stats.start_seconds:.1f}s, "
+            f"{stats.recycled} recycled, {stats.failures} failed; {ops or 'no operations'}"
+        )
+
+    def _acquire(self) -> PooledExcel:
+        while True:
+            with self._cond:
+                while not self._idle and self._live >= self.size:
+                    self._cond.wait()
+                if self._idle:
+                    instance = self._idle.pop()
+                else:
+                    self._live += 1
+                    instance = None
+            if instance is None:
+                return self._start()
+            if excel_is_healthy(instance.app):
+                return instance
+            print("[WARN] Pooled Excel instance is unresponsive or left a workbook open; starting a new one")
+            self._retire(instance)
+
+    def _start(self) -> PooledExcel:
+        start = time.perf_counter()
+        try:
+            app = self.factory()
+        except BaseException:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        elapsed = time.perf_counter() - start
+        self.stats.starts += 1
+        self.stats.start_seconds += elapsed
+        print(f"[INFO] Started Excel in {elapsed:.2f}s")
+        if self._finalizer is None:
+            # Runs at interpreter exit and when a pool worker process shuts down.
+            self._finalizer = mp_util.Finalize(None, self.close, exitpriority=10)
+        return PooledExcel(app)
+
+    def _release(self, instance: PooledExcel) -> None:
+        with self._cond:
+            self._idle.append(instance)
+            self._cond.notify()
+
+    def _retire(self, instance: PooledExcel) -> None:
+        quit_excel(instance.app)
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
@@ -0,0 +1,173 @@
+"""
+Excel reading with the fastest installed pandas engine.
+
+pandas defaults to openpyxl for .xlsx, which is by far the slowest reader for
+large workbooks. read_excel() picks the first engine from ENGINE_PREFERENCE
+whose package is installed (python-calamine, then openpyxl; .xls prefers
+calamine, then xlrd), retries once with pandas' default engine if the chosen
+one cannot open the file, and prints how long each read took. Other errors
+(a missing sheet, bad usecols) go straight to the caller. iter_sheet_rows() streams the
+first sheet row by row for callers that parse exports themselves, and
+frame_from_rows() turns rows already read that way into the DataFrame
+read_excel would have returned, so a sheet never has to be opened twice.
+
+Shared by concur-expense and payment-list.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import time
+import zipfile
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+ENGINE_PREFERENCE = {
+    ".xls": ("calamine", "xlrd"),
+    "default": ("calamine", "openpyxl"),
+}
+ENGINE_MODULES = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+    "xlrd": "xlrd",
+}
+# What each engine raises for a file it cannot open (unknown, corrupt or
+# unsupported format), as opposed to a bad sheet_name/usecols (ValueError).
+ENGINE_FORMAT_ERRORS = {
+    "calamine": (("python_calamine", "CalamineError"),),
+    "openpyxl": (("openpyxl.utils.exceptions", "InvalidFileException"),),
+    "xlrd": (("xlrd", "XLRDError"),),
+}
+
+
+@lru_cache(maxsize=None)
+def engine_available(engine: str) -> bool:
+    module = ENGINE_MODULES.get(engine, engine)
+    return importlib.util.find_spec(module) is not None
+
+
+@lru_cache(maxsize=None)
+def engine_format_errors(engine: str) -> tuple[type[Exception], ...]:
+    """Exceptions after which read_excel retries engine's read with pandas' default engine."""
+    errors: list[type[Exception]] = [ImportError, zipfile.BadZipFile]
+    for module_name, name in ENGINE_FORMAT_ERRORS.get(engine, ()):
+        try:
+            errors.append(getattr(importlib.import_module(module_name), name))
+        except (ImportError, AttributeError):
+            continue
+    return tuple(errors)
+
+
+def select_engine(path: Path, suffix: str | None = None) -> str | None:
+    """Return the preferred installed engine for path, or None for pandas' default.
+
+    suffix overrides the file's own suffix when the real format is known to
+    differ (e.g. ".xlsx" for a zip workbook saved as .xls).
+    """
+    suffix = (suffix or Path(path).suffix).lower()
+    preference = ENGINE_PREFERENCE.get(suffix, ENGINE_PREFERENCE["default"])
+    for engine in preference:
+        if engine_available(engine):
+            return engine
+    return None
+
+
+def read_excel(path: Path, engine: str | None = None, **kwargs):
+    """pd.read_excel with engine selection, default-engine fallback and read timing."""
+    path = Path(path)
+    engine = engine or select_engine(path)
+    start = time.perf_counter()
+    try:
+        result = pd.read_excel(path, engine=engine, **kwargs)
+    except Exception as exc:
+        if engine is None or not isinstance(exc, engine_format_errors(engine)):
+            raise
+        print(f"[WARN] {engine} could not read {path.name} ({exc}); retrying with the default engine")
+        engine = None
+        result = pd.read_excel(path, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] Read {path.name} with {engine or 'default'} engine in {elapsed:.2f}s")
+    return result
+
+
+def convert_cell(value):
+    """Match pandas' Excel engines: empty cells are "", integral floats become int
+    and dates become datetime."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def iter_sheet_rows(path: Path, engine: str | None = None) -> Iterator[tuple]:
+    """Yield the first sheet's rows as value tuples without building a DataFrame.
+
+    calamine and openpyxl (read-only) hand rows over one at a time; any other
+    engine falls back to a headerless read_excel. Both are given an open file
+    rather than the path, so they go by the content and not the suffix (SAP
+    saves some xlsx exports as .xls). Cells are converted the way read_excel
+    converts them (empty cells are ""), so frame_from_rows() over these rows
+    matches a read_excel of the same sheet.
+    """
+    path = Path(path)
+    engine = engine or select_engine(path)
+    if engine == "calamine":
+        from python_calamine import CalamineWorkbook
+
+        with path.open("rb") as handle:
+            workbook = CalamineWorkbook.from_filelike(handle)
+        try:
+            sheet = workbook.get_sheet_by_index(0)
+            # iter_rows() starts at the first used column; pad back to column A.
+            pad = ("",) * (sheet.start[1] if sheet.start else 0)
+            for row in sheet.iter_rows():
+                yield pad + tuple(convert_cell(value) for value in row)
+        finally:
+            workbook.close()
+        return
+    if engine == "openpyxl":
+        from openpyxl import load_workbook
+
+        with path.open("rb") as handle:
+            workbook = load_workbook(handle, read_only=True, data_only=True)
+            try:
+                for row in workbook.worksheets[0].iter_rows(values_only=True):
+                    yield tuple(convert_cell(value) for value in row)
+            finally:
+                workbook.close()
+        return
+    frame = read_excel(path, engine=engine, header=None)
+    for row in frame.itertuples(index=False, name=None):
+        yield tuple("" if pd.isna(value) else value for value in row)
+
+
+def frame_from_rows(rows: Iterable[Sequence], header: int | None = 0) -> pd.DataFrame:
+    """Build a DataFrame from sheet rows with read_excel's header and type handling.
+
+    Uses the same TextParser pandas runs over engine rows, so duplicate headers
+    are mangled (DD, DD.1), blank headers become 'Unnamed: n' and columns get
+    the same dtypes as a read_excel(header=...) of the sheet.
+    """
+    data = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        data.append(row)
+    while data and not data[-1]:
+        data.pop()
+    if not data:
+        return pd.DataFrame()
+    width = max(len(row) for row in data)
+    for row in data:
+        row.extend([""] * (width - len(row)))
+    return TextParser(data, header=header, skip_blank_lines=False).read()
@@ -0,0 +1,147 @@
+"""
+Column-wise dict building for vendor and employee lookups.
+
+Vendor master lists run to tens of thousands of rows, and building their
+dicts with iterrows plus a try/except per row dominated start-up.
+build_lookup() coerces the key and value columns as whole Series, drops the
+rejected rows with one mask and builds the dict with a single zip. Later rows
+win on duplicate keys, as in the old loops. LookupStats reports how many rows
+were blank, rejected or duplicated.
+
+The coercers mirror the scalar conversions the tools used before: numeric
+cells are converted as arrays, and only text cells the array path cannot
+decide go through the old scalar rule, so the results are identical.
+
+Shared by concur-expense and payment-list.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+
+@dataclass
+class LookupStats:
+    rows: int = 0
+    blank: int = 0
+    rejected: int = 0
+    duplicates: int = 0
+    conflicts: int = 0
+    keys: int = 0
+
+    def describe(self) -> str:
+        text = f"{self.keys} keys from {self.rows} rows"
+        details = []
+        if self.blank:
+            details.append(f"{self.blank} blank")
+        if self.rejected:
+            details.append(f"{self.rejected} rejected")
+        if self.duplicates:
+            details.append(
+                f"{self.duplicates} duplicate ({self.conflicts} with a different value)"
+            )
+        return f"{text}; {', '.join(details)}" if details else text
+
+
+def is_text(series: pd.Series) -> np.ndarray:
+    return (series.map(type) == str).to_numpy(dtype=bool)
+
+
+def scalar_int_id(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def int_ids(series: pd.Series) -> pd.Series:
+    """int(value) per cell (floats truncate, text must be an integer literal); NA when it fails."""
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    ok = np.isfinite(values)
+    result = pd.Series(
+        pd.array(np.trunc(np.where(ok, values, 0)).astype(np.int64), dtype="Int64"),
+        index=series.index,
+    )
+    result[~ok] = pd.NA
+    if series.dtype.kind not in "biuf":
+        text = np.flatnonzero(is_text(series))
+        if text.size:
+            # int() takes " 12 " but not "1.5" or "1e3", which to_numeric would accept.
+            # Positional assignment works for object and pandas' str dtype alike.
+            result.iloc[text] = pd.array(
+                [scalar_int_id(value) for value in series.iloc[text]], dtype="Int64"
+            )
+    return result
+
+
+def scalar_id_text(value) -> str:
+    try:
+        return str(int(round(float(value))))
+    except Exception:
+        return str(value).strip()
+
+
+def id_text(series: pd.Series) -> pd.Series:
+    """str(int(round(float(value)))) per cell, else the stripped text; NA when empty."""
+    numbers = pd.to_numeric(series, errors="coerce")
+    values = numbers.to_numpy(dtype=float, na_value=np.nan)
+    ok = np.isfinite(values)
+    result = pd.Series(np.full(len(series), None, dtype=object), index=series.index)
+    if ok.any():
+        # np.round rounds half to even, like round().
+        result[ok] = np.round(values[ok]).astype(np.int64).astype(str).astype(object)
+    if (~ok).any():
+        result[~ok] = [scalar_id_text(value) for value in series[~ok]]
+    return result.where(result != "", None)
+
+
+def stripped_text(series: pd.Series) -> pd.Series:
+    """str(value).strip() per cell; NA when empty."""
+    text = series.astype(str).str.strip()
+    return text.where(text != "", None)
+
+
+def lower_text(series: pd.Series) -> pd.Series:
+    """str(value).strip().lower() per cell; NA when empty."""
+    text = series.astype(str).str.strip().str.lower()
+    return text.where(text != "", None)
+
+
+def alnum_upper(series: pd.Series) -> pd.Series:
+    """Upper-cased letters and digits only (spacing/punctuation dropped); NA when empty."""
+    text = series.astype(str).str.upper().str.replace(NON_ALNUM_RE, "", regex=True)
+    return text.where(text != "", None)
+
+
+def build_lookup(
+    keys: pd.Series,
+    values: pd.Series,
+    key_fn: Callable[[pd.Series], pd.Series],
+    value_fn: Callable[[pd.Series], pd.Series],
+) -> tuple[dict, LookupStats]:
+    """Return ({key: value}, stats) from two aligned columns.
+
+    Rows with a missing cell are blank; rows whose key or value coerces to NA
+    are rejected; on duplicate keys the last row wins.
+    """
+    stats = LookupStats(rows=len(keys))
+    present = keys.notna().to_numpy() & values.notna().to_numpy()
+    stats.blank = int((~present).sum())
+    coerced_keys = key_fn(keys[present])
+    coerced_values = value_fn(values[present])
+    ok = coerced_keys.notna().to_numpy() & coerced_values.notna().to_numpy()
+    stats.rejected = int((~ok).sum())
+
+    pairs = pd.DataFrame({"key": coerced_keys[ok], "value": coerced_values[ok]})
+    lookup = dict(zip(pairs["key"].tolist(), pairs["value"].tolist()))
+    stats.keys = len(lookup)
+    stats.duplicates = len(pairs) - stats.keys
+    stats.conflicts = len(pairs.drop_duplicates()) - stats.keys
+    return lookup, stats
@@ -0,0 +1,76 @@
+"""
+Persistent cache for lookups parsed from Excel workbooks.
+
+Vendor lists, NAME ID maps and the OneDrive working notes change rarely, but
+parsing them through openpyxl dominates tool start-up. Each resolved lookup
+dict is pickled under 03-outputs/lookup-cache/, keyed by the loader kind,
+the workbook path and the sheet/usecols that were read. An entry is only
+reused while the workbook's mtime and size still match; otherwise it is
+re-parsed and overwritten.
+
+Shared by concur-expense and payment-list.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Callable
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+CACHE_ROOT = BASE_DIR / "03-outputs" / "lookup-cache"
+CACHE_FORMAT_VERSION = 2
+
+
+def file_signature(path: Path) -> tuple[int, int]:
+    """Return (mtime_ns, size) used to detect changed workbooks."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cache_entry_path(kind: str, path: Path, sheet=None, usecols=None) -> Path:
+    ident = repr((str(path.resolve()).lower(), sheet, usecols))
+    digest = hashlib.sha1(ident.encode("utf-8")).hexdigest()[:16]
+    return CACHE_ROOT / f"{kind}-{digest}.pickle"
+
+
+def cached_lookup(
+    kind: str,
+    path: Path,
+    loader: Callable[[], dict],
+    sheet=None,
+    usecols=None,
+    enabled: bool = True,
+) -> dict:
+    """Return loader() for path, reusing the on-disk entry while the workbook is unchanged."""
+    if not enabled:
+        return loader()
+
+    entry_path = cache_entry_path(kind, path, sheet, usecols)
+    signature = file_signature(path)
+    key = (CACHE_FORMAT_VERSION, kind, str(path.resolve()), sheet, usecols)
+    if entry_path.exists():
+        try:
+            with entry_path.open("rb") as handle:
+                entry = pickle.load(handle)
+            if entry.get("key") == key and entry.get("signature") == signature:
+                return entry["value"]
+        except Exception as exc:  # pragma: no cover - defensive logging
+            print(f"[WARN] Ignoring unreadable lookup cache {entry_path.name}: {exc}")
+
+    value = loader()
+    try:
+        CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+        temp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with temp_path.open("wb") as handle:
+            pickle.dump(
+                {"key": key, "signature": signature, "value": value},
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temp_path, entry_path)
+    except OSError as exc:  # pragma: no cover - cache is best effort
+        print(f"[WARN] Could not write lookup cache {entry_path.name}: {exc}")
+    return value
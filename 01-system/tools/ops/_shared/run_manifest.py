@@ -0,0 +1,107 @@
+"""
+Run manifest for incremental tool runs.
+
+Each tool keeps 03-outputs/<tool>/manifest.json with one entry per input file:
+the input's content hash, the hash of the lookups it was converted with, the
+tool's code version and the outputs it produced. An input is skipped when all
+of these still match and its outputs still exist; new or changed inputs,
+changed lookups or a changed tool script trigger reprocessing.
+
+Shared by concur-expense and payment-list.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+MANIFEST_NAME = "manifest.json"
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_lookups(*lookups: dict) -> str:
+    """Return an order-independent sha256 of one or more lookup dicts."""
+    digest = hashlib.sha256()
+    for lookup in lookups:
+        items = sorted((repr(key), repr(value)) for key, value in lookup.items())
+        digest.update(repr(items).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def code_version(*paths: Path) -> str:
+    """Return a short hash of the tool's source files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def manifest_key(path: Path) -> str:
+    resolved = path.resolve()
+    try:
+        return resolved.relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return resolved.as_posix()
+
+
+class RunManifest:
+    """Track which inputs were converted with which lookups and code version."""
+
+    def __init__(self, output_root: Path, version: str, force: bool = False):
+        self.path = output_root / MANIFEST_NAME
+        self.version = version
+        self.force = force
+        self.entries: dict[str, dict] = {}
+        self.skipped: list[Path] = []
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("inputs", {})
+            except (OSError, ValueError) as exc:
+                print(f"[WARN] Ignoring unreadable manifest {self.path}: {exc}")
+
+    def is_current(self, input_path: Path, input_hash: str, lookup_hash: str) -> bool:
+        """True when input_path was already converted with the same content, lookups and code."""
+        if self.force:
+            return False
+        entry = self.entries.get(manifest_key(input_path))
+        if not entry:
+            return False
+        return (
+            entry.get("input_hash") == input_hash
+            and entry.get("lookup_hash") == lookup_hash
+            and entry.get("code_version") == self.version
+            and all((BASE_DIR / output).exists() for output in entry.get("outputs", []))
+        )
+
+    def record(
+        self, input_path: Path, input_hash: str, lookup_hash: str, outputs: list[Path]
+    ) -> None:
+        self.entries[manifest_key(input_path)] = {
+            "input_hash": input_hash,
+            "lookup_hash": lookup_hash,
+            "code_version": self.version,
+            "outputs": [manifest_key(output) for output in outputs],
+            "processed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps({"inputs": self.entries}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(temp_path, self.path)
@@ -0,0 +1,221 @@
+"""
+Header detection and column normalization for SAP ALV/text-list exports.
+
+SAP exports start with a few title rows, spell the same column several ways
+(Net due dt / DD / Due date, LC amnt / Amount in local cur.) and often carry
+duplicate columns. HeaderSynonyms holds the canonical column names and their
+accepted spellings; regions whose layouts differ pass their own table.
+
+The preview block is normalized once as a 2-D array and every row is scored
+against the table in one go; duplicate columns are resolved from non-null
+counts computed once for the whole frame.
+
+Used by payment-list.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_header_cell(value: object) -> str:
+    return WHITESPACE_RE.sub(" ", str(value).strip()).lower()
+
+
+@dataclass(frozen=True)
+class HeaderSynonyms:
+    """Canonical SAP columns and the (normalized) header spellings that map to them.
+
+    fallbacks are only renamed when no column is already named exactly like the
+    canonical one (e.g. Inv. Ref. stands in for a missing Reference). A header
+    row must contain one of the anchor's spellings and match at least
+    min_matches canonical columns. Duplicates of the coalesce columns (DD and
+    DD.1, ...) are collapsed into one; placeholders lists cell text that repeats
+    the header inside a column and does not count as data when choosing.
+    """
+
+    columns: dict[str, tuple[str, ...]]
+    fallbacks: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    anchor: str = "Vendor"
+    min_matches: int = 2
+    coalesce: tuple[str, ...] = ()
+    placeholders: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    def with_synonyms(self, **extra: tuple[str, ...]) -> HeaderSynonyms:
+        """Return a copy accepting extra spellings, keyed by canonical name."""
+        columns = dict(self.columns)
+        for name, spellings in extra.items():
+            columns[name] = columns.get(name, ()) + tuple(
+                normalize_header_cell(s) for s in spellings
+            )
+        return replace(self, columns=columns)
+
+    @cached_property
+    def anchor_pattern(self) -> re.Pattern:
+        """Case-insensitive search for any anchor spelling, to pre-filter text lines."""
+        spellings = sorted(self.columns[self.anchor], key=len, reverse=True)
+        return re.compile("|".join(re.escape(s) for s in spellings), re.IGNORECASE)
+
+    @property
+    def canonical(self) -> list[str]:
+        return list(dict.fromkeys([*self.columns, *self.fallbacks]))
+
+    def spelling_codes(self) -> dict[str, int]:
+        """Map every accepted spelling (fallbacks included) to its canonical column index."""
+        index = {name: i for i, name in enumerate(self.canonical)}
+        codes: dict[str, int] = {}
+        for table in (self.columns, self.fallbacks):
+            for name, spellings in table.items():
+                for spelling in spellings:
+                    codes.setdefault(spelling, index[name])
+        return codes
+
+
+SAP_HEADERS = HeaderSynonyms(
+    columns={
+        "Vendor": ("vendor",),
+        "Reference": ("reference",),
+        "DD": ("dd", "net due dt", "due date"),
+        "Amount in local cur.": (
+            "amount in local cur.",
+            "amount in local cur",
+            "amount in local currency",
+            "lc amnt",
+        ),
+    },
+    fallbacks={"Reference": ("inv. ref.", "inv ref")},
+    coalesce=("DD", "Reference", "Amount in local cur."),
+    placeholders={"DD": ("dd", "")},
+)
+
+
+def score_header_rows(
+    cells: np.ndarray, headers: HeaderSynonyms = SAP_HEADERS
+) -> np.ndarray:
+    """Return a per-row boolean mask of rows that look like the export header.
+
+    cells is a 2-D object array (rows x columns); missing cells are None/NaN.
+    """
+    if cells.size == 0:
+        return np.zeros(cells.shape[0], dtype=bool)
+    present = pd.notna(cells)
+    row_idx, col_idx = np.nonzero(present)
+    text = np.array([str(v) for v in cells[row_idx, col_idx]], dtype=object)
+    # Normalize each distinct cell text once, then map spellings to column codes.
+    uniques, inverse = np.unique(text, return_inverse=True)
+    codes = headers.spelling_codes()
+    unique_codes = np.array(
+        [codes.get(normalize_header_cell(u), -1) for u in uniques], dtype=np.int64
+    )
+    cell_codes = unique_codes[inverse.reshape(-1)]
+    matched = cell_codes >= 0
+
+    hits = np.zeros((cells.shape[0], len(headers.canonical)), dtype=bool)
+    hits[row_idx[matched], cell_codes[matched]] = True
+    anchor = headers.canonical.index(headers.anchor)
+    return hits[:, anchor] & (hits.sum(axis=1) >= headers.min_matches)
+
+
+def find_header_row(preview: pd.DataFrame, headers: HeaderSynonyms = SAP_HEADERS) -> int:
+    """Find the first row that looks like the SAP export header (0 when none does)."""
+    mask = score_header_rows(preview.to_numpy(dtype=object), headers)
+    if not mask.any():
+        return 0
+    return int(preview.index[int(mask.argmax())])
+
+
+def is_header_line(cells: list[str], headers: HeaderSynonyms = SAP_HEADERS) -> bool:
+    """True when a split text-list line is the (possibly repeated) header."""
+    return bool(score_header_rows(np.array([cells], dtype=object), headers)[0])
+
+
+def normalize_columns(df: pd.DataFrame, headers: HeaderSynonyms = SAP_HEADERS) -> pd.DataFrame:
+    """Strip/rename SAP columns to their canonical names and collapse duplicates."""
+    df.columns = [
+        WHITESPACE_RE.sub(" ", str(col).strip()) if col is not None else ""
+        for col in df.columns
+    ]
+    keys = [normalize_header_cell(col) for col in df.columns]
+    renames = {
+        spelling: name
+        for name, spellings in headers.columns.items()
+        for spelling in spellings
+    }
+    for name, spellings in headers.fallbacks.items():
+        if name not in df.columns:
+            renames.update({spelling: name for spelling in spellings if spelling not in renames})
+
+    df.columns = [renames.get(key, col) for key, col in zip(keys, df.columns)]
+    keep = [
+        i
+        for i, (key, col) in enumerate(zip(keys, df.columns))
+        if col and not key.startswith("unnamed")
+    ]
+    df = df.iloc[:, keep]
+
+    counts = df.notna().to_numpy().sum(axis=0)
+    for name in headers.coalesce:
+        df, counts = coalesce_duplicate_columns(
+            df, name, counts, headers.placeholders.get(name, ())
+        )
+    return df
+
+
+def count_placeholders(series: pd.Series, placeholders: tuple[str, ...]) -> int:
+    if series.dtype.kind in "biufcmM":
+        return 0
+    allowed = set(placeholders)
+    return sum(
+        1
+        for value in series.to_numpy(dtype=object)
+        if isinstance(value, str) and value.strip().lower() in allowed
+    )
+
+
+def coalesce_duplicate_columns(
+    df: pd.DataFrame,
+    base_name: str,
+    counts: np.ndarray,
+    placeholders: tuple[str, ...] = (),
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """Collapse duplicate columns like DD/DD.1 into a single base_name column.
+
+    The column with the most non-null cells (minus placeholder cells) wins;
+    counts holds the per-position non-null counts and is returned updated.
+    """
+    positions = [
+        i
+        for i, col in enumerate(df.columns)
+        if col == base_name or str(col).startswith(f"{base_name}.")
+    ]
+    if len(positions) <= 1:
+        return df, counts
+
+    scores = [
+        int(counts[pos])
+        - (count_placeholders(df.iloc[:, pos], placeholders) if placeholders else 0)
+        for pos in positions
+    ]
+    best_pos = positions[int(np.argmax(scores))]
+    insert_at = min(positions)
+    keep = [i for i in range(df.shape[1]) if i not in positions or i == best_pos]
+    df = df.iloc[:, keep]
+    counts = counts[keep]
+    df.columns = [
+        base_name if i == best_pos else col
+        for i, col in zip(keep, df.columns)
+    ]
+    if best_pos != insert_at:
+        # Nothing before the first duplicate was dropped, so it lands at insert_at.
+        order = list(range(df.shape[1]))
+        order.insert(insert_at, order.pop(keep.index(best_pos)))
+        df = df.iloc[:, order]
+        counts = counts[order]
+    return df, counts
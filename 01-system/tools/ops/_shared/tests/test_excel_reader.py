@@ -0,0 +1,69 @@
+"""read_excel only retries with pandas' default engine when the chosen engine cannot open the file."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import excel_reader  # noqa: E402
+from excel_reader import read_excel  # noqa: E402
+
+
+@pytest.fixture
+def workbook(tmp_path: Path) -> Path:
+    path = tmp_path / "vendors.xlsx"
+    pd.DataFrame({"Vendor": [1, 2], "Name": ["Alpha", "Beta"]}).to_excel(path, index=False)
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch) -> list:
+    calls = []
+    original = pd.read_excel
+
+    def counting_read_excel(*args, **kwargs):
+        calls.append(kwargs.get("engine"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(excel_reader.pd, "read_excel", counting_read_excel)
+    return calls
+
+
+@pytest.mark.parametrize("engine", ["calamine", "openpyxl"])
+@pytest.mark.parametrize(
+    "kwargs, error",
+    [
+        ({"sheet_name": "Missing"}, ValueError),
+        ({"usecols": ["Missing"]}, ValueError),
+        ({"usecols": "Y:Z"}, pd.errors.ParserError),
+    ],
+)
+def test_bad_sheet_or_columns_raise_without_retry(workbook, reads, capsys, engine, kwargs, error) -> None:
+    if not excel_reader.engine_available(engine):
+        pytest.skip(f"{engine} not installed")
+    with pytest.raises(error):
+        read_excel(workbook, engine=engine, **kwargs)
+    assert reads == [engine]
+    assert "[WARN]" not in capsys.readouterr().out
+
+
+def test_unreadable_format_retries_with_default_engine(tmp_path, reads, capsys) -> None:
+    if not excel_reader.engine_available("calamine"):
+        pytest.skip("calamine not installed")
+    path = tmp_path / "broken.xlsx"
+    path.write_bytes(b"not a workbook")
+    # The default engine sniffs the content and cannot place it either.
+    with pytest.raises(ValueError, match="format cannot be determined"):
+        read_excel(path, engine="calamine")
+    assert reads == ["calamine", None]
+    assert "[WARN] calamine could not read broken.xlsx" in capsys.readouterr().out
+
+
+def test_reads_with_selected_engine(workbook, reads) -> None:
+    frame = read_excel(workbook, usecols=[0, 1])
+    assert frame.to_dict("list") == {"Vendor": [1, 2], "Name": ["Alpha", "Beta"]}
+    assert reads == [excel_reader.select_engine(workbook)]
@@ -0,0 +1,60 @@
+"""Column-wise coercers must agree with the scalar rules whatever dtype pandas gives the column."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from lookup_builder import (  # noqa: E402
+    build_lookup,
+    id_text,
+    int_ids,
+    scalar_id_text,
+    scalar_int_id,
+    stripped_text,
+)
+
+COLUMNS = {
+    "str_numeric": pd.Series(["101", "202", " 303 "], dtype="str"),
+    "str_mixed": pd.Series(["101", "x", "1.5", "1e3", "-7"], dtype="str"),
+    "object_mixed": pd.Series([101, "202", 3.0, "x", " 44 ", 5.9], dtype=object),
+    "object_text": pd.Series(["101", "202"], dtype=object),
+    "int": pd.Series([101, 202, 303], dtype="int64"),
+    "float": pd.Series([101.0, 2.7, -3.2], dtype="float64"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(COLUMNS))
+def test_int_ids_matches_scalar_int(name: str) -> None:
+    series = COLUMNS[name]
+    expected = [scalar_int_id(value) for value in series]
+    result = int_ids(series)
+    assert [None if pd.isna(value) else int(value) for value in result] == expected
+    assert result.index.equals(series.index)
+
+
+@pytest.mark.parametrize("name", sorted(COLUMNS))
+def test_id_text_matches_scalar_id_text(name: str) -> None:
+    series = COLUMNS[name]
+    expected = [scalar_id_text(value) or None for value in series]
+    assert [None if pd.isna(value) else value for value in id_text(series)] == expected
+
+
+def test_build_lookup_on_str_dtype_ids() -> None:
+    keys = pd.Series(["101", "x", "202", "101", None], dtype="str")
+    values = pd.Series(["Alpha", "Beta", " Gamma ", "Delta", "Eps"], dtype="str")
+    lookup, stats = build_lookup(keys, values, int_ids, stripped_text)
+    assert lookup == {101: "Delta", 202: "Gamma"}
+    assert (stats.rows, stats.blank, stats.rejected, stats.duplicates, stats.conflicts) == (5, 1, 1, 1, 1)
+
+
+def test_build_lookup_keeps_non_default_index() -> None:
+    keys = pd.Series(np.array([7.0, 8.0]), index=[10, 20])
+    values = pd.Series(["a", "b"], index=[10, 20], dtype=object)
+    lookup, _ = build_lookup(keys, values, int_ids, stripped_text)
+    assert lookup == {7: "a", 8: "b"}
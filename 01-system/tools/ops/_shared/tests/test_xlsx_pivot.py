@@ -0,0 +1,74 @@
+"""save_with_pivot must produce a complete package in one save, with every part written once."""
+
+from __future__ import annotations
+
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from xlsx_pivot import build_pivot, pivot_sheet_rows, save_with_pivot  # noqa: E402
+
+FRAME = pd.DataFrame({
+    "Supplier": ["Alpha", "Beta", "Alpha", None],
+    "Reference": ["R1", "R2", "R3", "R4"],
+    "Amount": [10.0, -2.5, 4.0, 1.0],
+})
+
+
+def write_workbook(path: Path, write_only: bool, hyperlink: bool = False) -> None:
+    layout = build_pivot(FRAME, ["Supplier", "Reference"], "Amount", "TestPivot")
+    wb = Workbook(write_only=write_only)
+    if not write_only:
+        wb.remove(wb.active)
+    ws_data = wb.create_sheet("Sheet1")
+    ws_data.append(list(FRAME.columns))
+    for row in FRAME.itertuples(index=False, name=None):
+        ws_data.append(list(row))
+    ws_pivot = wb.create_sheet("Sheet2")
+    ws_pivot.append(["Title"])
+    ws_pivot.append([])
+    ws_pivot.append([])
+    for row in pivot_sheet_rows(ws_pivot, layout):
+        ws_pivot.append([cell.value if hasattr(cell, "value") else cell for cell in row])
+    if hyperlink:
+        ws_pivot["A1"].hyperlink = "https://example.com"
+    save_with_pivot(wb, path, "Sheet2", layout)
+
+
+@pytest.mark.parametrize("write_only", [True, False])
+def test_save_with_pivot_package(tmp_path: Path, write_only: bool) -> None:
+    path = tmp_path / "pivot.xlsx"
+    write_workbook(path, write_only)
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        assert len(names) == len(set(names))
+        assert {
+            "xl/pivotCache/pivotCacheDefinition1.xml",
+            "xl/pivotCache/pivotCacheRecords1.xml",
+            "xl/pivotTables/pivotTable1.xml",
+            "xl/worksheets/_rels/sheet2.xml.rels",
+        } <= set(names)
+        content_types = archive.read("[Content_Types].xml").decode()
+        assert content_types.count("pivotCacheDefinition+xml") == 1
+        assert "<pivotCaches>" in archive.read("xl/workbook.xml").decode()
+
+    wb = load_workbook(path)
+    assert [pivot.name for pivot in wb["Sheet2"]._pivots] == ["TestPivot"]
+    assert wb["Sheet1"].max_row == len(FRAME) + 1
+
+
+def test_save_with_pivot_keeps_existing_sheet_relationships(tmp_path: Path) -> None:
+    path = tmp_path / "pivot.xlsx"
+    write_workbook(path, write_only=False, hyperlink=True)
+    with zipfile.ZipFile(path) as archive:
+        rels = archive.read("xl/worksheets/_rels/sheet2.xml.rels").decode()
+    assert "hyperlink" in rels and "pivotTable" in rels
+    assert 'Id="rId2"' in rels
+    wb = load_workbook(path)
+    assert wb["Sheet2"]["A1"].hyperlink.target == "https://example.com"
+    assert len(wb["Sheet2"]._pivots) == 1
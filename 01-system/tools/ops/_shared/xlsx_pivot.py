@@ -0,0 +1,542 @@
+"""
+Native pivot tables for workbooks written with pandas/openpyxl.
+
+build_pivot() lays out a tabular pivot (row fields in separate columns, one
+summed data field, subtotals on the first row field, grand total) from a
+DataFrame and serializes the three package parts Excel needs: the pivot cache
+definition, the cache records and the pivot table definition.
+pivot_sheet_rows() yields the computed pivot cells so the values show even
+before Excel refreshes, and save_with_pivot() saves an openpyxl workbook
+with the parts added in the same save: the (large) sheet parts are written
+once, and only the small package bookkeeping parts are edited in memory
+before they reach the archive. Only public OOXML packaging is touched, not
+openpyxl internals. The cache is marked
+refreshOnLoad, so Excel rebuilds it from the source range when the workbook
+is opened.
+
+Used by payment-list instead of creating the pivot through Excel COM.
+"""
+
+from __future__ import annotations
+
+import math
+import posixpath
+import re
+import zipfile
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Iterable
+from xml.etree import ElementTree
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+from openpyxl.utils.datetime import to_excel
+from openpyxl.writer.excel import ExcelWriter
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+REL_TYPES = {
+    "cache": f"{REL_NS}/pivotCacheDefinition",
+    "records": f"{REL_NS}/pivotCacheRecords",
+    "table": f"{REL_NS}/pivotTable",
+}
+CONTENT_TYPES = {
+    "cache": "application/vnd.openxmlformats-officedocument.spreadsheetml.pivotCacheDefinition+xml",
+    "records": "application/vnd.openxmlformats-officedocument.spreadsheetml.pivotCacheRecords+xml",
+    "table": "application/vnd.openxmlformats-officedocument.spreadsheetml.pivotTable+xml",
+}
+PART_PATHS = {
+    "cache": "/xl/pivotCache/pivotCacheDefinition1.xml",
+    "records": "/xl/pivotCache/pivotCacheRecords1.xml",
+    "table": "/xl/pivotTables/pivotTable1.xml",
+}
+CONTENT_TYPES_PATH = "[Content_Types].xml"
+WORKBOOK_PATH = "xl/workbook.xml"
+WORKBOOK_RELS_PATH = "xl/_rels/workbook.xml.rels"
+HELD_PARTS = {CONTENT_TYPES_PATH, WORKBOOK_PATH, WORKBOOK_RELS_PATH}
+SHEET_RELS_RE = re.compile(r"xl/worksheets/_rels/[^/]+\.xml\.rels")
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+DATE_FORMAT_ID = 14
+# pandas' ExcelWriter default, so rendered DD labels match the Sheet1 source cells.
+DATE_NUMBER_FORMAT = "yyyy-mm-dd hh:mm:ss"
+BLANK_LABEL = "(blank)"
+# workbook.xml children that must come after <pivotCaches> (CT_Workbook order).
+AFTER_PIVOT_CACHES = (
+    "<smartTagPr",
+    "<smartTagTypes",
+    "<webPublishing",
+    "<fileRecoveryPr",
+    "<webPublishObjects",
+    "<extLst",
+)
+
+
+@dataclass
+class PivotLayout:
+    """A laid-out pivot: rendered cells plus the serialized package parts."""
+
+    name: str
+    anchor: str
+    rows: list[tuple]
+    date_columns: set[int]
+    data_column: int
+    number_format: str
+    parts: dict[str, str] = field(default_factory=dict)
+
+
+def cache_value(value):
+    """Normalize a cell value to None, bool, int, float, datetime or str."""
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (pd.Timestamp, datetime, date, np.datetime64)):
+        stamp = pd.Timestamp(value)
+        return None if pd.isna(stamp) else stamp.to_pydatetime().replace(tzinfo=None)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        return float(value)
+    if pd.isna(value):
+        return None
+    return ILLEGAL_XML_CHARS.sub("", str(value))
+
+
+def item_sort_key(value) -> tuple:
+    """Excel's default ascending item order: numbers/dates, text, booleans, blank."""
+    if value is None:
+        return (3, 0)
+    if isinstance(value, bool):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (0, to_excel(value))
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, value.lower(), value)
+
+
+def item_key(value) -> tuple:
+    """Identity of a pivot item: Excel merges 1 with 1.0 and text that differs only in case."""
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, (int, float)):
+        return ("number", float(value))
+    if isinstance(value, str):
+        return ("text", value.lower())
+    return (type(value).__name__, value)
+
+
+def format_number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def value_xml(value) -> str:
+    """Serialize a cache value as a record/shared item element."""
+    if value is None:
+        return "<m/>"
+    if isinstance(value, bool):
+        return f'<b v="{int(value)}"/>'
+    if isinstance(value, datetime):
+        return f'<d v="{value.isoformat(timespec="seconds")}"/>'
+    if isinstance(value, (int, float)):
+        return f'<n v="{format_number(value)}"/>'
+    return f"<s v={quoteattr(value)}/>"
+
+
+def shared_items_xml(values: list, items: list | None) -> str:
+    """Return <sharedItems> with Excel's type flags; items are listed for axis fields."""
+    kinds = set()
+    numbers: list[float] = []
+    dates: list[datetime] = []
+    for value in values:
+        if value is None:
+            kinds.add("blank")
+        elif isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, datetime):
+            kinds.add("date")
+            dates.append(value)
+        elif isinstance(value, (int, float)):
+            kinds.add("number")
+            numbers.append(value)
+        else:
+            kinds.add("string")
+    typed = kinds - {"blank"}
+    attrs: list[str] = []
+    if not kinds & {"string", "blank", "bool"}:
+        attrs.append('containsSemiMixedTypes="0"')
+    if "date" in kinds and not kinds & {"string", "number", "bool"}:
+        attrs.append('containsNonDate="0"')
+    if "date" in kinds:
+        attrs.append('containsDate="1"')
+    if "string" not in kinds:
+        attrs.append('containsString="0"')
+    if len(typed) > 1:
+        attrs.append('containsMixedTypes="1"')
+    if "number" in kinds:
+        attrs.append('containsNumber="1"')
+        if all(float(number).is_integer() for number in numbers):
+            attrs.append('containsInteger="1"')
+        attrs.append(f'minValue="{format_number(min(numbers))}"')
+        attrs.append(f'maxValue="{format_number(max(numbers))}"')
+    if "blank" in kinds:
+        attrs.append('containsBlank="1"')
+    if dates:
+        attrs.append(f'minDate="{min(dates).isoformat(timespec="seconds")}"')
+        attrs.append(f'maxDate="{max(dates).isoformat(timespec="seconds")}"')
+    if items is None:
+        return f"<sharedItems {' '.join(attrs)}/>" if attrs else "<sharedItems/>"
+    attrs.append(f'count="{len(items)}"')
+    body = "".join(value_xml(item) for item in items)
+    return f"<sharedItems {' '.join(attrs)}>{body}</sharedItems>"
+
+
+def display_label(value):
+    """Value shown for an item in the rendered pivot cells."""
+    return BLANK_LABEL if value is None else value
+
+
+def total_label(value) -> str:
+    if value is None:
+        return f"{BLANK_LABEL} Total"
+    if isinstance(value, datetime):
+        return f"{value:%Y-%m-%d %H:%M:%S} Total"
+    if isinstance(value, float):
+        return f"{format_number(value)} Total"
+    return f"{value} Total"
+
+
+def build_pivot(
+    df: pd.DataFrame,
+    row_fields: list[str],
+    data_field: str,
+    name: str,
+    source_sheet: str = "Sheet1",
+    anchor: str = "A4",
+    data_caption: str | None = None,
+    number_format: str = "#,##0.00",
+    number_format_id: int = 4,
+) -> PivotLayout:
+    """Lay out a tabular pivot of df (as written to source_sheet at A1 with a header row)."""
+    columns = [str(col) for col in df.columns]
+    data_caption = data_caption or f"Sum of {data_field}"
+    row_positions = [columns.index(column) for column in row_fields]
+    data_position = columns.index(data_field)
+    column_values = [[cache_value(value) for value in df.iloc[:, pos].tolist()] for pos in range(len(columns))]
+    record_count = len(df.index)
+
+    # Shared items are kept in first-seen order (as Excel builds them); the
+    # pivot field lists them in sorted order, which is what gets displayed.
+    shared: dict[int, list] = {}
+    shared_index: dict[int, list[int]] = {}
+    display_order: dict[int, list[int]] = {}
+    for pos in row_positions:
+        lookup: dict[tuple, int] = {}
+        items: list = []
+        indexes: list[int] = []
+        for value in column_values[pos]:
+            key = item_key(value)
+            index = lookup.get(key)
+            if index is None:
+                index = lookup[key] = len(items)
+                items.append(value)
+            indexes.append(index)
+        shared[pos] = items
+        shared_index[pos] = indexes
+        display_order[pos] = sorted(range(len(items)), key=lambda i, items=items: item_sort_key(items[i]))
+
+    # Rendered rows: group by each row field's display position, in order.
+    frame = pd.DataFrame({
+        f"f{level}": pd.Series(shared_index[pos], dtype="int64").map(
+            {shared_i: rank for rank, shared_i in enumerate(display_order[pos])}
+        )
+        for level, pos in enumerate(row_positions)
+    })
+    # Like Excel, only numeric cells are summed; text amounts count as blank.
+    frame["amount"] = pd.Series(
+        [
+            value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+            for value in column_values[data_position]
+        ],
+        dtype="float64",
+    )
+    level_cols = [f"f{level}" for level in range(len(row_positions))]
+    leaf = frame.groupby(level_cols, sort=True)["amount"].sum(min_count=1)
+    top = frame.groupby(level_cols[0], sort=True)["amount"].sum(min_count=1)
+    grand = frame["amount"].sum(min_count=1)
+
+    def item_at(level: int, rank: int):
+        pos = row_positions[level]
+        return shared[pos][display_order[pos][rank]]
+
+    def amount_cell(value):
+        return None if pd.isna(value) else float(value)
+
+    width = len(row_positions) + 1
+    rendered: list[tuple] = [tuple(row_fields) + (data_caption,)]
+    row_items: list[str] = []
+    previous: tuple | None = None
+    leaf_keys = list(leaf.index) if len(row_positions) > 1 else [(key,) for key in leaf.index]
+    for key, amount in zip(leaf_keys, leaf.tolist()):
+        if previous is not None and previous[0] != key[0]:
+            row_items.append(f'<i t="default"><x v="{previous[0]}"/></i>')
+            rendered.append((total_label(item_at(0, previous[0])),) + (None,) * (width - 2) + (amount_cell(top[previous[0]]),))
+        repeat = 0
+        if previous is not None and previous[0] == key[0]:
+            while repeat < len(key) - 1 and previous[repeat] == key[repeat]:
+                repeat += 1
+        xs = "".join("<x/>" if rank == 0 else f'<x v="{rank}"/>' for rank in key[repeat:])
+        row_items.append(f'<i r="{repeat}">{xs}</i>' if repeat else f"<i>{xs}</i>")
+        cells = [None] * repeat + [display_label(item_at(level, rank)) for level, rank in enumerate(key) if level >= repeat]
+        rendered.append(tuple(cells) + (amount_cell(amount),))
+        previous = key
+    if previous is not None:
+        row_items.append(f'<i t="default"><x v="{previous[0]}"/></i>')
+        rendered.append((total_label(item_at(0, previous[0])),) + (None,) * (width - 2) + (amount_cell(top[previous[0]]),))
+    row_items.append('<i t="grand"><x/></i>')
+    rendered.append(("Grand Total",) + (None,) * (width - 2) + (amount_cell(grand),))
+
+    anchor_col, anchor_row = coordinate_from_string(anchor)
+    first_col = column_index_from_string(anchor_col)
+    location = (
+        f"{anchor}:{get_column_letter(first_col + width - 1)}{anchor_row + len(rendered) - 1}"
+    )
+    source_ref = f"A1:{get_column_letter(max(len(columns), 1))}{record_count + 1}"
+
+    cache_fields = []
+    for pos, column in enumerate(columns):
+        values = column_values[pos]
+        is_date = any(isinstance(value, datetime) for value in values)
+        fmt = f' numFmtId="{DATE_FORMAT_ID}"' if is_date else ' numFmtId="0"'
+        items = shared.get(pos)
+        cache_fields.append(
+            f"<cacheField name={quoteattr(column)}{fmt}>{shared_items_xml(values, items)}</cacheField>"
+        )
+    cache_definition = (
+        f'{XML_DECLARATION}<pivotCacheDefinition xmlns="{MAIN_NS}" xmlns:r="{REL_NS}" r:id="rId1" '
+        f'refreshOnLoad="1" createdVersion="6" refreshedVersion="6" minRefreshableVersion="3" '
+        f'recordCount="{record_count}">'
+        f'<cacheSource type="worksheet"><worksheetSource ref="{source_ref}" sheet={quoteattr(source_sheet)}/>'
+        f'</cacheSource><cacheFields count="{len(columns)}">{"".join(cache_fields)}</cacheFields>'
+        "</pivotCacheDefinition>"
+    )
+
+    record_columns = []
+    for pos in range(len(columns)):
+        if pos in shared_index:
+            record_columns.append([f'<x v="{index}"/>' for index in shared_index[pos]])
+        else:
+            record_columns.append([value_xml(value) for value in column_values[pos]])
+    records_body = "".join(f"<r>{''.join(cells)}</r>" for cells in zip(*record_columns)) if columns else ""
+    cache_records = (
+        f'{XML_DECLARATION}<pivotCacheRecords xmlns="{MAIN_NS}" xmlns:r="{REL_NS}" count="{record_count}">'
+        f"{records_body}</pivotCacheRecords>"
+    )
+
+    pivot_fields = []
+    for pos in range(len(columns)):
+        if pos in row_positions:
+            first = pos == row_positions[0]
+            items = "".join(f'<item x="{index}"/>' for index in display_order[pos])
+            count = len(display_order[pos]) + (1 if first else 0)
+            subtotal = '<item t="default"/>' if first else ""
+            default = "" if first else ' defaultSubtotal="0"'
+            pivot_fields.append(
+                f'<pivotField axis="axisRow" compact="0" outline="0" showAll="0"{default}>'
+                f'<items count="{count}">{items}{subtotal}</items></pivotField>'
+            )
+        elif pos == data_position:
+            pivot_fields.append('<pivotField dataField="1" compact="0" outline="0" showAll="0"/>')
+        else:
+            pivot_fields.append('<pivotField compact="0" outline="0" showAll="0"/>')
+    row_field_refs = "".join(f'<field x="{pos}"/>' for pos in row_positions)
+    table = (
+        f'{XML_DECLARATION}<pivotTableDefinition xmlns="{MAIN_NS}" name={quoteattr(name)} cacheId="1" '
+        'applyNumberFormats="0" applyBorderFormats="0" applyFontFormats="0" applyPatternFormats="0" '
+        'applyAlignmentFormats="0" applyWidthHeightFormats="1" dataCaption="Values" updatedVersion="6" '
+        'minRefreshableVersion="3" useAutoFormatting="1" itemPrintTitles="1" createdVersion="6" indent="0" '
+        'compact="0" compactData="0" outline="1" outlineData="1" multipleFieldFilters="0">'
+        f'<location ref="{location}" firstHeaderRow="1" firstDataRow="1" firstDataCol="{len(row_positions)}"/>'
+        f'<pivotFields count="{len(columns)}">{"".join(pivot_fields)}</pivotFields>'
+        f'<rowFields count="{len(row_positions)}">{row_field_refs}</rowFields>'
+        f'<rowItems count="{len(row_items)}">{"".join(row_items)}</rowItems>'
+        '<colItems count="1"><i/></colItems>'
+        f'<dataFields count="1"><dataField name={quoteattr(data_caption)} fld="{data_position}" '
+        f'baseField="0" baseItem="0" numFmtId="{number_format_id}"/></dataFields>'
+        '<pivotTableStyleInfo name="PivotStyleLight16" showRowHeaders="1" showColHeaders="1" '
+        'showRowStripes="0" showColStripes="0" showLastColumn="1"/>'
+        "</pivotTableDefinition>"
+    )
+
+    date_columns = {
+        level for level, pos in enumerate(row_positions) if any(isinstance(v, datetime) for v in shared[pos])
+    }
+    return PivotLayout(
+        name=name,
+        anchor=anchor,
+        rows=rendered,
+        date_columns=date_columns,
+        data_column=len(row_positions),
+        number_format=number_format,
+        parts={"cache": cache_definition, "records": cache_records, "table": table},
+    )
+
+
+def pivot_sheet_rows(worksheet, layout: PivotLayout) -> Iterable[list]:
+    """Yield the pivot's computed cells as rows for worksheet.append, starting at the anchor row.
+
+    The caller appends anchor_row - 1 rows (titles, spacing) first.
+    """
+    anchor_col, _ = coordinate_from_string(layout.anchor)
+    padding = [None] * (column_index_from_string(anchor_col) - 1)
+    for row_offset, values in enumerate(layout.rows):
+        cells = list(padding)
+        for col_offset, value in enumerate(values):
+            if value is None or row_offset == 0:
+                cells.append(value)
+                continue
+            cell = WriteOnlyCell(worksheet, value=value)
+            if col_offset == layout.data_column:
+                cell.number_format = layout.number_format
+            elif col_offset in layout.date_columns and isinstance(value, datetime):
+                cell.number_format = DATE_NUMBER_FORMAT
+            cells.append(cell)
+        yield cells
+
+
+def relationships_xml(rels: list[tuple[str, str, str]]) -> str:
+    body = "".join(
+        f"<Relationship Id={quoteattr(rid)} Type={quoteattr(rtype)} Target={quoteattr(target)}/>"
+        for rid, rtype, target in rels
+    )
+    return f'{XML_DECLARATION}<Relationships xmlns="{PACKAGE_REL_NS}">{body}</Relationships>'
+
+
+def next_relationship_id(rels_xml: str | None) -> str:
+    used = {int(num) for num in re.findall(r'Id="rId(\d+)"', rels_xml or "")}
+    return f"rId{max(used, default=0) + 1}"
+
+
+def insert_relationship(rels_xml: str | None, rid: str, rtype: str, target: str) -> str:
+    element = f"<Relationship Id={quoteattr(rid)} Type={quoteattr(rtype)} Target={quoteattr(target)}/>"
+    if not rels_xml:
+        return relationships_xml([(rid, rtype, target)])
+    return rels_xml.replace("</Relationships>", f"{element}</Relationships>", 1)
+
+
+def sheet_part_path(workbook_xml: str, workbook_rels_xml: str, sheet_name: str) -> str:
+    """Resolve a sheet name to its part path via workbook.xml and its relationships."""
+    workbook = ElementTree.fromstring(workbook_xml)
+    rels = ElementTree.fromstring(workbook_rels_xml)
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels}
+    for sheet in workbook.iter(f"{{{MAIN_NS}}}sheet"):
+        if sheet.get("name") == sheet_name:
+            target = targets[sheet.get(f"{{{REL_NS}}}id")]
+            if target.startswith("/"):
+                return target[1:]
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(f"Sheet {sheet_name!r} not found in workbook")
+
+
+def pivot_package_parts(parts: dict[str, str], sheet_name: str, layout: PivotLayout) -> dict[str, str]:
+    """Return the package bookkeeping parts with layout's pivot registered, plus the pivot parts.
+
+    parts holds [Content_Types].xml, xl/workbook.xml, its relationships and
+    any worksheet relationship parts; the pivot table is anchored on
+    sheet_name.
+    """
+    edited = dict(parts)
+    sheet_path = sheet_part_path(edited[WORKBOOK_PATH], edited[WORKBOOK_RELS_PATH], sheet_name)
+    sheet_dir, sheet_file = posixpath.split(sheet_path)
+    sheet_rels_path = f"{sheet_dir}/_rels/{sheet_file}.rels"
+
+    overrides = "".join(
+        f'<Override PartName="{PART_PATHS[kind]}" ContentType="{CONTENT_TYPES[kind]}"/>'
+        for kind in ("cache", "records", "table")
+    )
+    edited[CONTENT_TYPES_PATH] = edited[CONTENT_TYPES_PATH].replace(
+        "</Types>", f"{overrides}</Types>", 1
+    )
+
+    cache_rid = next_relationship_id(edited[WORKBOOK_RELS_PATH])
+    edited[WORKBOOK_RELS_PATH] = insert_relationship(
+        edited[WORKBOOK_RELS_PATH], cache_rid, REL_TYPES["cache"], PART_PATHS["cache"]
+    )
+    workbook_xml = edited[WORKBOOK_PATH]
+    root_start = workbook_xml.index("<workbook")
+    if 'xmlns:r="' not in workbook_xml[root_start : workbook_xml.index(">", root_start)]:
+        workbook_xml = workbook_xml.replace("<workbook ", f'<workbook xmlns:r="{REL_NS}" ', 1)
+    insert_at = min(
+        (workbook_xml.index(tag) for tag in AFTER_PIVOT_CACHES if tag in workbook_xml),
+        default=workbook_xml.rindex("</workbook>"),
+    )
+    edited[WORKBOOK_PATH] = (
+        f'{workbook_xml[:insert_at]}<pivotCaches><pivotCache cacheId="1" r:id="{cache_rid}"/>'
+        f"</pivotCaches>{workbook_xml[insert_at:]}"
+    )
+
+    sheet_rels = edited.get(sheet_rels_path)
+    edited[sheet_rels_path] = insert_relationship(
+        sheet_rels, next_relationship_id(sheet_rels), REL_TYPES["table"], PART_PATHS["table"]
+    )
+
+    edited.update({
+        PART_PATHS["cache"][1:]: layout.parts["cache"],
+        "xl/pivotCache/_rels/pivotCacheDefinition1.xml.rels": relationships_xml(
+            [("rId1", REL_TYPES["records"], "pivotCacheRecords1.xml")]
+        ),
+        PART_PATHS["records"][1:]: layout.parts["records"],
+        PART_PATHS["table"][1:]: layout.parts["table"],
+        "xl/pivotTables/_rels/pivotTable1.xml.rels": relationships_xml(
+            [("rId1", REL_TYPES["cache"], "../pivotCache/pivotCacheDefinition1.xml")]
+        ),
+    })
+    return edited
+
+
+class PivotArchive(zipfile.ZipFile):
+    """Write-mode .xlsx archive that holds back the package bookkeeping parts.
+
+    Every other part (notably the large worksheet XML) is compressed straight
+    into the archive as openpyxl writes it. The small bookkeeping parts are
+    kept in memory until add_pivot() writes them with the pivot registered,
+    together with the pivot parts.
+    """
+
+    def __init__(self, xlsx_path: Path) -> None:
+        super().__init__(xlsx_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True)
+        self.held: dict[str, str] = {}
+
+    def writestr(self, zinfo_or_arcname, data, *args, **kwargs) -> None:
+        name = getattr(zinfo_or_arcname, "filename", zinfo_or_arcname)
+        if name in HELD_PARTS or SHEET_RELS_RE.fullmatch(name):
+            self.held[name] = data.decode("utf-8") if isinstance(data, bytes) else data
+            return
+        super().writestr(zinfo_or_arcname, data, *args, **kwargs)
+
+    def add_pivot(self, sheet_name: str, layout: PivotLayout) -> None:
+        for name, data in pivot_package_parts(self.held, sheet_name, layout).items():
+            super().writestr(name, data)
+        self.held = {}
+
+
+def save_with_pivot(workbook: Workbook, xlsx_path: Path, sheet_name: str, layout: PivotLayout) -> None:
+    """Save an openpyxl workbook with layout's pivot table on sheet_name, in a single save."""
+    if workbook.write_only and not workbook.worksheets:
+        workbook.create_sheet()
+    workbook.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    with PivotArchive(Path(xlsx_path)) as archive:
+        ExcelWriter(workbook, archive).write_data()
+        archive.add_pivot(sheet_name, layout)
@@ -3,12 +3,26 @@
 
 from __future__ import annotations
 
+import argparse
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, date
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+SHARED_DIR = Path(__file__).resolve().parents[1] / "_shared"
+sys.path.insert(0, str(SHARED_DIR))
+from excel_reader import read_excel  # noqa: E402
+from lookup_builder import alnum_upper, build_lookup, id_text, lower_text  # noqa: E402
+from lookup_cache import cached_lookup  # noqa: E402
+from run_manifest import RunManifest, code_version, hash_file, hash_lookups  # noqa: E402
 
 BASE_DIR = Path(__file__).resolve().parents[4]
 INPUT_ROOT = BASE_DIR / "02-inputs" / "Concur"
@@ -55,6 +69,31 @@ GST_ZERO_TOLERANCE = 0.01
 MIXED_TOLERANCE = 0.05
 EXPECTED_GST_RATE = {"AU": 0.10, "NZ": 0.15}
 
+# Extract columns the conversion reads; enough when Raw_Input is not a full copy.
+CONCUR_COLUMNS = [
+    "Employee ID",
+    "Employee First Name",
+    "Employee Last Name",
+    "Report ID",
+    "Report Submit Date",
+    "Report Entry Transaction Date",
+    "Report Entry Expense Type Name",
+    "Report Entry Vendor Name",
+    "Report Entry Payment Code Name",
+    "Report Entry Tax Code",
+    "Report Entry Total Tax Posted Amount",
+    "Report Entry Tax Posted Amount",
+    "Journal Payer Payment Type Name",
+    "Journal Debit Or Credit",
+    "Journal Account Code",
+    "Journal Amount",
+    "Department",
+    *MIXED_COLS,
+    MIXED_TAXABLE_DERIVED_COL,
+    MIXED_NONTAXABLE_DERIVED_COL,
+]
+RAW_SHEET_MODES = ("full", "stream", "link", "omit")
+
 def normalize_account(value) -> str:
     if pd.isna(value):
         return ""
@@ -191,57 +230,144 @@ def classify_line(row: pd.Series, region: str) -> pd.Series:
     row[MIXED_NOTE_COL] = note
     return row
 
-def load_vendor_lookup(path: Path) -> dict[str, str]:
-    if not path.exists():
-        return {}
-    df = pd.read_excel(path, usecols=[0, 1])
-    df = df.dropna()
-    lookup: dict[str, str] = {}
-    for _, row in df.iterrows():
-        supplier_id = row.iloc[0]
-        name = row.iloc[1]
-        try:
-            supplier_id_str = str(int(round(float(supplier_id))))
-        except Exception:
-            supplier_id_str = str(supplier_id).strip()
-        lookup[normalize_name(str(name))] = supplier_id_str
+
+def coerce_positive_series(series: pd.Series) -> pd.Series:
+    """Column-wise coerce_positive_number; numeric columns skip the per-cell path."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float).abs().fillna(0.0)
+    return series.map(coerce_positive_number).astype(float)
+
+
+def round_amounts(values: pd.Series) -> pd.Series:
+    """Round to cents with Python round() so results match the scalar code paths exactly."""
+    return pd.Series([round(value, 2) for value in values], index=values.index, dtype=float)
+
+
+def classify_lines(df: pd.DataFrame, region: str) -> pd.DataFrame:
+    """Column-wise classify_line: same L0/L1/mixed/CHECK outcome for the whole frame in one pass."""
+    expected_rate = EXPECTED_GST_RATE.get(region.upper())
+    if expected_rate is None or df.empty:
+        return df
+    df = df.copy()
+    index = df.index
+
+    def column(name: str, default) -> pd.Series:
+        if name in df.columns:
+            return df[name]
+        return pd.Series(default, index=index, dtype=object)
+
+    gross_abs = pd.to_numeric(column("gross_amount", 0.0), errors="coerce").astype(float).abs()
+    gst_abs = pd.to_numeric(column("gst_amount", 0.0), errors="coerce").astype(float).abs()
+    notes = pd.Series([str(value or "") for value in column(MIXED_NOTE_COL, "")], index=index, dtype=object)
+    taxable = coerce_positive_series(column(TAXABLE_AMT_COL, 0.0))
+    nontaxable = coerce_positive_series(column(NONTAXABLE_AMT_COL, 0.0))
+    tax_code = column("tax_code", None).astype(object).copy()
+    taxable_derived = taxable.copy()
+    nontaxable_derived = nontaxable.copy()
+
+    expected_ratio = expected_rate / (1 + expected_rate)  # GST / gross
+    rate = (gst_abs / gross_abs.where(gross_abs > 0.009)).fillna(float("inf"))
+
+    # Same case order as classify_line: each mask excludes the rows decided before it.
+    zero_gst = gst_abs <= GST_ZERO_TOLERANCE
+    with_gross = ~zero_gst & (gross_abs > 0.009)
+    full_rate = with_gross & ((rate - expected_ratio).abs() <= GST_RATE_TOLERANCE)
+    candidate = with_gross & ~full_rate & (rate < (expected_ratio - GST_RATE_TOLERANCE))
+
+    flags = pd.Series("N", index=index, dtype=object)
+    tax_code[zero_gst] = "L0"
+    tax_code[full_rate] = "L1"
+
+    if candidate.any():
+        cand_gross = gross_abs[candidate]
+        split_taxable = round_amounts(gst_abs[candidate] / expected_ratio)
+        split_nontaxable = round_amounts(cand_gross - split_taxable)
+        valid = (split_taxable <= cand_gross + MIXED_TOLERANCE) & (split_nontaxable >= -MIXED_TOLERANCE)
+        mixed_idx = valid.index[valid]
+        check_idx = valid.index[~valid]
+
+        split_nontaxable = split_nontaxable.clip(lower=0.0)
+        flags[mixed_idx] = "Y"
+        taxable[mixed_idx] = split_taxable[mixed_idx]
+        nontaxable[mixed_idx] = split_nontaxable[mixed_idx]
+        taxable_derived[mixed_idx] = split_taxable[mixed_idx]
+        nontaxable_derived[mixed_idx] = split_nontaxable[mixed_idx]
+        notes[mixed_idx] = notes[mixed_idx].where(
+            notes[mixed_idx] != "", "Auto-split mixed (GST below full rate)"
+        )
+        tax_code[mixed_idx] = "L1"
+        flags[check_idx] = "CHECK"
+        notes[check_idx] = "Mixed candidate but derived split invalid; review GST/gross."
+
+    df[MIXED_FLAG_COL] = flags
+    df[TAXABLE_AMT_COL] = taxable
+    df[NONTAXABLE_AMT_COL] = nontaxable
+    df[MIXED_TAXABLE_DERIVED_COL] = taxable_derived
+    df[MIXED_NONTAXABLE_DERIVED_COL] = nontaxable_derived
+    df[MIXED_NOTE_COL] = notes
+    df["tax_code"] = tax_code
+    return df
+
+
+def read_vendor_lookup(path: Path) -> dict[str, str]:
+    df = read_excel(path, usecols=[0, 1])
+    # Keyed by normalize_name() of the supplier name; blank names are rejected.
+    lookup, stats = build_lookup(df.iloc[:, 1], df.iloc[:, 0], alnum_upper, id_text)
+    print(f"[INFO] Vendor list {path.name}: {stats.describe()}")
     return lookup
 
 
-def load_employee_map(path: Path | None, sheet: str | None = None) -> dict[str, str]:
-    if not path or not path.exists():
+def load_vendor_lookup(path: Path, use_cache: bool = True) -> dict[str, str]:
+    if not path.exists():
         return {}
-    if sheet:
-        try:
-            df = pd.read_excel(path, sheet_name=sheet)
-        except ValueError:
-            df = pd.read_excel(path)
-    else:
-        df = pd.read_excel(path)
+    return cached_lookup(
+        "concur-vendor",
+        path,
+        lambda: read_vendor_lookup(path),
+        usecols=(0, 1),
+        enabled=use_cache,
+    )
+
+
+def read_employee_map(path: Path, sheet: str | None = None) -> dict[str, str]:
     # assume first two columns correspond to employee ID and supplier ID
-    if df.shape[1] < 2:
-        return {}
-    df = df.iloc[:, :2].dropna()
-    mapping: dict[str, str] = {}
-    for _, row in df.iterrows():
-        emp_id = normalize_employee_id(row.iloc[0])
-        supplier_id = row.iloc[1]
-        if not emp_id:
-            continue
+    for sheet_name in ([sheet, 0] if sheet else [0]):
         try:
-            supplier_str = str(int(round(float(supplier_id))))
-        except Exception:
-            supplier_str = str(supplier_id).strip()
-        if supplier_str:
-            mapping[emp_id] = supplier_str
+            df = read_excel(path, sheet_name=sheet_name, usecols=[0, 1])
+            break
+        except pd.errors.ParserError:
+            # fewer than two columns
+            return {}
+        except ValueError:
+            if sheet_name == 0:
+                raise
+    mapping, stats = build_lookup(df.iloc[:, 0], df.iloc[:, 1], lower_text, id_text)
+    print(f"[INFO] Employee map {path.name}: {stats.describe()}")
     return mapping
 
 
-def read_concur_file(path: Path) -> pd.DataFrame:
+def load_employee_map(path: Path | None, sheet: str | None = None, use_cache: bool = True) -> dict[str, str]:
+    if not path or not path.exists():
+        return {}
+    return cached_lookup(
+        "concur-employee",
+        path,
+        lambda: read_employee_map(path, sheet),
+        sheet=sheet,
+        enabled=use_cache,
+    )
+
+
+def read_concur_file(path: Path, usecols: Iterable[str] | None = None) -> pd.DataFrame:
+    """Read an extract; with usecols only those columns are loaded (absent ones are ignored)."""
+    selector = None if usecols is None else set(usecols).__contains__
     suffix = path.suffix.lower()
     if suffix == ".csv":
-        return pd.read_csv(path)
-    return pd.read_excel(path, sheet_name=0)
+        start = time.perf_counter()
+        df = pd.read_csv(path, usecols=selector)
+        print(f"[INFO] Read {path.name} with csv reader in {time.perf_counter() - start:.2f}s")
+        return df
+    return read_excel(path, sheet_name=0, usecols=selector)
 
 
 def map_employee_to_vendor(first: str, last: str, lookup: dict[str, str]) -> str:
@@ -280,18 +406,58 @@ def normalize_key_value(value) -> str:
     return str(value).strip().upper()
 
 
-def build_merge_key(row: pd.Series) -> tuple:
-    emp = normalize_key_value(row.get("Employee ID"))
-    report = normalize_key_value(row.get("Report ID"))
-    transaction_date = normalize_key_value(row.get("Report Entry Transaction Date"))
-    expense_type = normalize_key_value(row.get("Report Entry Expense Type Name"))
-    vendor_name = normalize_key_value(row.get("Report Entry Vendor Name"))
-    account = normalize_account(row.get("Journal Account Code")).upper()
-    if transaction_date and expense_type and vendor_name:
-        return ("KEY1", emp, report, transaction_date, expense_type, vendor_name, account)
-    if transaction_date:
-        return ("KEY2", emp, report, transaction_date, account)
-    return ("KEY3", emp, report, account)
+MERGE_KEY_PARTS = [
+    "_key_kind",
+    "_key_employee",
+    "_key_report",
+    "_key_date",
+    "_key_expense_type",
+    "_key_vendor",
+    "_key_account",
+]
+
+
+def normalize_key_series(frame: pd.DataFrame, column: str) -> pd.Series:
+    """Column-wise normalize_key_value; missing columns normalize to blank keys."""
+    if column not in frame.columns:
+        return pd.Series("", index=frame.index, dtype=object)
+    return frame[column].map(normalize_key_value).astype(object)
+
+
+def build_merge_keys(frame: pd.DataFrame) -> pd.DataFrame:
+    """Return KEY1/KEY2/KEY3 merge keys as fixed-width columns (unused parts blank)."""
+    emp = normalize_key_series(frame, "Employee ID")
+    report = normalize_key_series(frame, "Report ID")
+    transaction_date = normalize_key_series(frame, "Report Entry Transaction Date")
+    expense_type = normalize_key_series(frame, "Report Entry Expense Type Name")
+    vendor_name = normalize_key_series(frame, "Report Entry Vendor Name")
+    if "Journal Account Code" in frame.columns:
+        account = frame["Journal Account Code"].map(normalize_account).astype(object).str.upper()
+    else:
+        account = pd.Series("", index=frame.index, dtype=object)
+
+    has_date = transaction_date.ne("")
+    key1 = has_date & expense_type.ne("") & vendor_name.ne("")
+    kind = pd.Series(np.select([key1, has_date], ["KEY1", "KEY2"], "KEY3"), index=frame.index, dtype=object)
+    return pd.DataFrame({
+        "_key_kind": kind,
+        "_key_employee": emp,
+        "_key_report": report,
+        "_key_date": transaction_date,
+        "_key_expense_type": expense_type.where(key1, ""),
+        "_key_vendor": vendor_name.where(key1, ""),
+        "_key_account": account,
+    }, index=frame.index)
+
+
+def merge_key_tuple(parts: tuple) -> tuple:
+    """Rebuild the KEY1/KEY2/KEY3 tuple from its fixed-width MERGE_KEY_PARTS form."""
+    kind, emp, report, transaction_date, expense_type, vendor_name, account = parts
+    if kind == "KEY1":
+        return (kind, emp, report, transaction_date, expense_type, vendor_name, account)
+    if kind == "KEY2":
+        return (kind, emp, report, transaction_date, account)
+    return (kind, emp, report, account)
 
 
 def format_merge_key(key: tuple) -> str:
@@ -307,35 +473,41 @@ def numeric_series(frame: pd.DataFrame, columns: list[str], default: float = 0.0
 
 
 def merge_gst_lines(expense_df: pd.DataFrame, gst_df: pd.DataFrame) -> tuple[pd.DataFrame, list[dict]]:
-    """Merge standalone GST lines (DR) back into expense lines (CR) using deterministic keys."""
+    """Merge standalone GST lines (DR) back into expense lines (CR) using deterministic keys.
+
+    GST is summed per key, joined onto the expense keys in one pass and allocated
+    pro rata to absolute gross within each key (equal split when gross is zero).
+    """
     expense_df = expense_df.copy()
-    expense_df["merge_key"] = expense_df.apply(build_merge_key, axis=1) if not expense_df.empty else pd.Series(dtype=object)
     unmatched: list[dict] = []
+    if gst_df is None or gst_df.empty:
+        return expense_df, unmatched
 
-    gst_totals = {}
-    if gst_df is not None and not gst_df.empty:
-        gst_df = gst_df.copy()
-        gst_df["merge_key"] = gst_df.apply(build_merge_key, axis=1)
-        gst_df["gst_value"] = numeric_series(
-            gst_df,
-            ["Report Entry Total Tax Posted Amount", "Report Entry Tax Posted Amount"],
-        )
-        gst_totals = gst_df.groupby("merge_key")["gst_value"].sum()
-    else:
-        gst_df = pd.DataFrame()
-
-    for key, gst_total in gst_totals.items():
-        mask = expense_df["merge_key"] == key
-        if mask.any():
-            share_base = expense_df.loc[mask, "gross_amount"].abs()
-            total_share = share_base.sum()
-            if total_share <= 0:
-                allocation = pd.Series([1.0 / len(share_base)] * len(share_base), index=share_base.index)
-            else:
-                allocation = share_base / total_share
-            expense_df.loc[mask, "gst_amount"] = gst_total * allocation
-        else:
-            sample = gst_df.loc[gst_df["merge_key"] == key].iloc[0]
+    gst_keys = build_merge_keys(gst_df)
+    gst_keys["gst_value"] = numeric_series(
+        gst_df,
+        ["Report Entry Total Tax Posted Amount", "Report Entry Tax Posted Amount"],
+    )
+    gst_totals = gst_keys.groupby(MERGE_KEY_PARTS)["gst_value"].sum()
+
+    expense_keys = build_merge_keys(expense_df)
+    matched_keys = gst_totals.index.isin(pd.MultiIndex.from_frame(expense_keys))
+
+    if matched_keys.any():
+        joined = expense_keys.join(gst_totals.rename("gst_total"), on=MERGE_KEY_PARTS)
+        has_gst = joined["gst_total"].notna()
+        share_base = expense_df.loc[has_gst, "gross_amount"].abs()
+        groups = share_base.groupby([joined.loc[has_gst, col] for col in MERGE_KEY_PARTS])
+        total_share = groups.transform("sum")
+        allocation = (share_base / total_share).where(total_share > 0, 1.0 / groups.transform("size"))
+        expense_df.loc[has_gst, "gst_amount"] = joined.loc[has_gst, "gst_total"] * allocation
+
+    if not matched_keys.all():
+        samples = gst_df.loc[~gst_keys.duplicated(MERGE_KEY_PARTS)]
+        samples.index = pd.MultiIndex.from_frame(gst_keys.loc[samples.index, MERGE_KEY_PARTS])
+        for parts, gst_total in gst_totals[~matched_keys].items():
+            key = merge_key_tuple(parts)
+            sample = samples.loc[parts]
             unmatched.append({
                 "Employee ID": sample.get("Employee ID", ""),
                 "Report ID": sample.get("Report ID", ""),
@@ -347,72 +519,81 @@ def merge_gst_lines(expense_df: pd.DataFrame, gst_df: pd.DataFrame) -> tuple[pd.
             })
             print(f"[WARN] GST line unmatched for key {format_merge_key(key)}: gst={gst_total:.2f}")
 
-    expense_df = expense_df.drop(columns=["merge_key"])
     return expense_df, unmatched
 
 def split_mixed_lines(df: pd.DataFrame) -> pd.DataFrame:
-    """Split flagged mixed-tax lines into separate L1/L0 rows using provided amounts."""
+    """Split flagged mixed-tax lines into separate L1/L0 rows using provided amounts.
+
+    Flagged rows are split as two derived frames (L1 then L0 portion) and
+    concatenated with the untouched rows, keeping the original row order.
+    """
     if df.empty:
         return df
-    rows = []
     tolerance = 0.05
-    for _, row in df.iterrows():
-        flag = str(row.get(MIXED_FLAG_COL, "")).upper()
-        if flag != "Y":
-            row_copy = row.copy()
-            row_copy[MIXED_FLAG_COL] = "N" if flag == "" else flag
-            row_copy["Mixed_Segment"] = "" if flag != "CHECK" else "Mixed candidate - review"
-            rows.append(row_copy)
-            continue
-
-        taxable = coerce_positive_number(row.get(TAXABLE_AMT_COL, 0.0))
-        non_taxable = coerce_positive_number(row.get(NONTAXABLE_AMT_COL, 0.0))
-        mixed_note = row.get(MIXED_NOTE_COL, "")
-
-        if taxable <= 0 and non_taxable <= 0:
-            row_copy = row.copy()
-            row_copy[MIXED_FLAG_COL] = "CHECK"
-            row_copy["Mixed_Segment"] = "Mixed candidate - missing amounts"
-            rows.append(row_copy)
-            continue
+    out = df.copy()
+    if MIXED_FLAG_COL in df.columns:
+        flags = df[MIXED_FLAG_COL].map(str).str.upper()
+    else:
+        flags = pd.Series("", index=df.index, dtype=object)
+    out[MIXED_FLAG_COL] = flags.where(flags != "", "N")
+    out["Mixed_Segment"] = np.where(flags.eq("CHECK"), "Mixed candidate - review", "")
 
-        gross_abs = abs(float(row.get("gross_amount", 0.0)))
-        total_specified = taxable + non_taxable
-        if abs(total_specified - gross_abs) > tolerance:
-            row_copy = row.copy()
-            row_copy[MIXED_FLAG_COL] = "CHECK"
-            row_copy["Mixed_Segment"] = "Mixed candidate - totals mismatch"
-            rows.append(row_copy)
-            continue
+    flagged = flags.eq("Y").to_numpy()
+    if not flagged.any():
+        return out
 
-        sign = -1.0 if float(row.get("gross_amount", 0.0)) < 0 else 1.0
-
-        # L1 portion
-        l1_row = row.copy()
-        l1_row["gross_amount"] = round(sign * taxable, 2)
-        l1_row["gst_amount"] = round(sign * taxable / 11, 2)
-        l1_row["net_amount"] = round(l1_row["gross_amount"] - l1_row["gst_amount"], 2)
-        l1_row["tax_code"] = "L1"
-        l1_row[MIXED_FLAG_COL] = "Y"
-        l1_row["Mixed_Segment"] = "L1 portion"
-        l1_row[MIXED_NOTE_COL] = mixed_note
-        l1_row[MIXED_TAXABLE_DERIVED_COL] = taxable
-        l1_row[MIXED_NONTAXABLE_DERIVED_COL] = non_taxable
-        rows.append(l1_row)
-
-        # L0 portion
-        l0_row = row.copy()
-        l0_row["gross_amount"] = round(sign * non_taxable, 2)
-        l0_row["gst_amount"] = 0.0
-        l0_row["net_amount"] = round(l0_row["gross_amount"], 2)
-        l0_row["tax_code"] = "L0"
-        l0_row[MIXED_FLAG_COL] = "Y"
-        l0_row["Mixed_Segment"] = "L0 portion"
-        l0_row[MIXED_NOTE_COL] = mixed_note
-        l0_row[MIXED_TAXABLE_DERIVED_COL] = taxable
-        l0_row[MIXED_NONTAXABLE_DERIVED_COL] = non_taxable
-        rows.append(l0_row)
-    return pd.DataFrame(rows)
+    candidates = df.loc[flagged]
+    taxable = coerce_positive_series(
+        candidates[TAXABLE_AMT_COL] if TAXABLE_AMT_COL in df.columns else pd.Series(0.0, index=candidates.index)
+    )
+    non_taxable = coerce_positive_series(
+        candidates[NONTAXABLE_AMT_COL] if NONTAXABLE_AMT_COL in df.columns else pd.Series(0.0, index=candidates.index)
+    )
+    gross = candidates["gross_amount"].astype(float)
+    missing = (taxable <= 0) & (non_taxable <= 0)
+    mismatch = ~missing & ((taxable + non_taxable - gross.abs()).abs() > tolerance)
+
+    check_segment = np.select(
+        [missing, mismatch],
+        ["Mixed candidate - missing amounts", "Mixed candidate - totals mismatch"],
+        "",
+    )
+    check_rows = np.flatnonzero(flagged)[(missing | mismatch).to_numpy()]
+    out.iloc[check_rows, out.columns.get_loc(MIXED_FLAG_COL)] = "CHECK"
+    out.iloc[check_rows, out.columns.get_loc("Mixed_Segment")] = check_segment[(missing | mismatch).to_numpy()]
+
+    valid = (~missing & ~mismatch).to_numpy()
+    split = np.flatnonzero(flagged)[valid]
+    taxable = taxable[valid]
+    non_taxable = non_taxable[valid]
+    sign = np.where(gross[valid] < 0, -1.0, 1.0)
+
+    # L1 portion
+    l1_rows = out.iloc[split].copy()
+    l1_rows["gross_amount"] = round_amounts(sign * taxable)
+    l1_rows["gst_amount"] = round_amounts(sign * taxable / 11)
+    l1_rows["net_amount"] = round_amounts(l1_rows["gross_amount"] - l1_rows["gst_amount"])
+    l1_rows["tax_code"] = "L1"
+    l1_rows["Mixed_Segment"] = "L1 portion"
+
+    # L0 portion
+    l0_rows = out.iloc[split].copy()
+    l0_rows["gross_amount"] = round_amounts(sign * non_taxable)
+    l0_rows["gst_amount"] = 0.0
+    l0_rows["net_amount"] = round_amounts(l0_rows["gross_amount"])
+    l0_rows["tax_code"] = "L0"
+    l0_rows["Mixed_Segment"] = "L0 portion"
+
+    for portion in (l1_rows, l0_rows):
+        portion[MIXED_TAXABLE_DERIVED_COL] = taxable
+        portion[MIXED_NONTAXABLE_DERIVED_COL] = non_taxable
+
+    keep = np.ones(len(df), dtype=bool)
+    keep[split] = False
+    positions = np.concatenate([np.flatnonzero(keep), split, split])
+    portion_order = np.concatenate([np.zeros(keep.sum()), np.zeros(len(split)), np.ones(len(split))])
+    combined = pd.concat([out.iloc[np.flatnonzero(keep)], l1_rows, l0_rows])
+    return combined.iloc[np.lexsort((portion_order, positions))]
 
 
 def validate_gst_rates(df: pd.DataFrame, region: str) -> None:
@@ -507,7 +688,7 @@ def prepare_company_rows(
     expense_lines, unmatched = merge_gst_lines(expense_lines, gst_lines)
     expense_lines["net_amount"] = expense_lines["gross_amount"] - expense_lines["gst_amount"]
     expense_lines["tax_code"] = expense_lines["gst_amount"].apply(determine_tax_code)
-    expense_lines = expense_lines.apply(lambda row: classify_line(row, region), axis=1)
+    expense_lines = classify_lines(expense_lines, region)
     expense_lines = split_mixed_lines(expense_lines)
     return expense_lines, unmatched
 
@@ -612,33 +793,29 @@ def build_gst_check(agg: pd.DataFrame, unmatched: list[dict] | None = None) -> p
 
     if not agg.empty:
         group_cols = ["Employee ID", "SAP Vendor ID", "Report ID", "Report Submit Date"]
-        mixed_lookup = (
-            agg.groupby(group_cols, dropna=False)[MIXED_FLAG_COL]
-            .apply(lambda s: "Y" if (s == "Y").any() else "N")
-        )
-        note_lookup = (
-            agg.groupby(group_cols, dropna=False)[MIXED_NOTE_COL]
-            .apply(lambda s: next((val for val in s if isinstance(val, str) and val.strip()), ""))
-        )
-        taxable_lookup = (
-            agg.groupby(group_cols, dropna=False)
-            .apply(lambda g: g.loc[
-                (g[MIXED_FLAG_COL] == "Y") & (g["tax_code"].str.upper() == "L1"), "gross_amount"
-            ].abs().sum())
-        )
-        nontaxable_lookup = (
-            agg.groupby(group_cols, dropna=False)
-            .apply(lambda g: g.loc[
-                (g[MIXED_FLAG_COL] == "Y") & (g["tax_code"].str.upper() == "L0"), "gross_amount"
-            ].abs().sum())
-        )
+        mixed_rows = agg[MIXED_FLAG_COL].eq("Y")
+        tax_codes = agg["tax_code"].str.upper()
+        gross_abs = agg["gross_amount"].abs()
+        notes = agg[MIXED_NOTE_COL]
+        has_note = notes.map(lambda val: isinstance(val, str) and bool(val.strip()))
         recon = (
-            agg.groupby(group_cols, dropna=False)
-            .agg({
-                "gross_amount": "sum",
-                "net_amount": "sum",
-                "gst_amount": "sum",
-            })
+            agg[group_cols + ["gross_amount", "net_amount", "gst_amount"]]
+            .assign(
+                _mixed=mixed_rows,
+                _note=notes.where(has_note),
+                _taxable=gross_abs.where(mixed_rows & tax_codes.eq("L1"), 0.0),
+                _nontaxable=gross_abs.where(mixed_rows & tax_codes.eq("L0"), 0.0),
+            )
+            .groupby(group_cols, dropna=False)
+            .agg(
+                gross_amount=("gross_amount", "sum"),
+                net_amount=("net_amount", "sum"),
+                gst_amount=("gst_amount", "sum"),
+                _mixed=("_mixed", "any"),
+                _note=("_note", "first"),
+                _taxable=("_taxable", "sum"),
+                _nontaxable=("_nontaxable", "sum"),
+            )
             .reset_index()
         )
         recon["Gross Amount"] = recon["gross_amount"].abs().round(2)
@@ -651,34 +828,10 @@ def build_gst_check(agg: pd.DataFrame, unmatched: list[dict] | None = None) -> p
         recon["GST Found"] = ""
         recon["Expense Matched"] = ""
         recon["Action"] = ""
-        recon[MIXED_FLAG_COL] = recon.apply(
-            lambda row: mixed_lookup.get(
-                (row["Employee ID"], row["SAP Vendor ID"], row["Report ID"], row["Report Submit Date"]),
-                "N",
-            ),
-            axis=1,
-        )
-        recon[MIXED_NOTE_COL] = recon.apply(
-            lambda row: note_lookup.get(
-                (row["Employee ID"], row["SAP Vendor ID"], row["Report ID"], row["Report Submit Date"]),
-                "",
-            ),
-            axis=1,
-        )
-        recon[MIXED_TAXABLE_DERIVED_COL] = recon.apply(
-            lambda row: taxable_lookup.get(
-                (row["Employee ID"], row["SAP Vendor ID"], row["Report ID"], row["Report Submit Date"]),
-                0.0,
-            ),
-            axis=1,
-        )
-        recon[MIXED_NONTAXABLE_DERIVED_COL] = recon.apply(
-            lambda row: nontaxable_lookup.get(
-                (row["Employee ID"], row["SAP Vendor ID"], row["Report ID"], row["Report Submit Date"]),
-                0.0,
-            ),
-            axis=1,
-        )
+        recon[MIXED_FLAG_COL] = recon["_mixed"].map({True: "Y", False: "N"})
+        recon[MIXED_NOTE_COL] = recon["_note"].fillna("")
+        recon[MIXED_TAXABLE_DERIVED_COL] = recon["_taxable"]
+        recon[MIXED_NONTAXABLE_DERIVED_COL] = recon["_nontaxable"]
         frames.append(recon[base_columns])
 
     if unmatched:
@@ -710,50 +863,148 @@ def build_gst_check(agg: pd.DataFrame, unmatched: list[dict] | None = None) -> p
     recon_full = pd.concat(frames, ignore_index=True)
     return recon_full[base_columns]
 
-def build_sap_view(agg: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    group_fields = ["Employee ID", "SAP Vendor ID", "Report ID", "Report Submit Date"]
-    for _, group in agg.groupby(group_fields, sort=False):
-        first = True
-        for _, row in group.iterrows():
-            text_value = ""
-            if row.get(MIXED_FLAG_COL, "") == "Y":
-                segment = row.get("Mixed_Segment", "").strip()
-                note = row.get(MIXED_NOTE_COL, "").strip()
-                parts = [part for part in [segment or "Mixed item", note] if part]
-                text_value = " | ".join(parts)
-            prefix = {
-                "Concur Employee ID": row["Employee ID"] if first else "",
-                "SAP Supplier ID": row["SAP Vendor ID"] if first else "",
-                "Report ID": row["Report ID"] if first else "",
-                "Report Submit Date": row["Report Submit Date"] if first else "",
-            }
-            rows.append({
-                **prefix,
-                "Account (I)": row["sap_account"],
-                "Assignment (J)": "",
-                "Amount (K)": row["sap_amount"],
-                "Tax Code": row["tax_code_display"],
-                "Text (M)": text_value,
-                "Cost Center (N)": row["Department"],
-            })
-            first = False
-        total_amount = round(group["sap_amount"].sum(), 2)
-        rows.append({
-            "Concur Employee ID": "",
-            "SAP Supplier ID": "",
-            "Report ID": "",
-            "Report Submit Date": "",
-            "Account (I)": "REPORT TOTAL",
-            "Assignment (J)": "",
-            "Amount (K)": total_amount,
-            "Tax Code": "",
-            "Text (M)": "Report total (validation only)",
-            "Cost Center (N)": "",
-        })
-    return pd.DataFrame(rows)
+SAP_VIEW_COLUMNS = [
+    "Concur Employee ID",
+    "SAP Supplier ID",
+    "Report ID",
+    "Report Submit Date",
+    "Account (I)",
+    "Assignment (J)",
+    "Amount (K)",
+    "Tax Code",
+    "Text (M)",
+    "Cost Center (N)",
+]
+SAP_VIEW_GROUP_FIELDS = ["Employee ID", "SAP Vendor ID", "Report ID", "Report Submit Date"]
+
+
+def build_sap_view_columns(agg: pd.DataFrame) -> tuple[dict[str, pd.Series], pd.Series, pd.Series]:
+    """Return SAP_Paste detail columns in report order, the report number per line and report totals.
+
+    Reports keep first-appearance order; only the first line of each report
+    carries the header fields. Lines with a blank report key are left out,
+    as groupby does by default.
+    """
+    lines = agg.dropna(subset=SAP_VIEW_GROUP_FIELDS)
+    group_no = lines.groupby(SAP_VIEW_GROUP_FIELDS, sort=False).ngroup()
+    order = np.argsort(group_no.to_numpy(), kind="stable")
+    lines = lines.iloc[order].reset_index(drop=True)
+    group_no = group_no.iloc[order].reset_index(drop=True)
+    first = lines.groupby(group_no, sort=False).cumcount().eq(0)
+
+    text = pd.Series("", index=lines.index, dtype=object)
+    mixed = lines[MIXED_FLAG_COL].eq("Y")
+    if mixed.any():
+        segment = lines.loc[mixed, "Mixed_Segment"].str.strip()
+        segment = segment.where(segment != "", "Mixed item")
+        note = lines.loc[mixed, MIXED_NOTE_COL].str.strip()
+        text[mixed] = segment.where(note == "", segment + " | " + note)
+
+    columns = {
+        "Concur Employee ID": lines["Employee ID"].where(first, ""),
+        "SAP Supplier ID": lines["SAP Vendor ID"].where(first, ""),
+        "Report ID": lines["Report ID"].where(first, ""),
+        "Report Submit Date": lines["Report Submit Date"].where(first, ""),
+        "Account (I)": lines["sap_account"],
+        "Assignment (J)": pd.Series("", index=lines.index, dtype=object),
+        "Amount (K)": lines["sap_amount"],
+        "Tax Code": lines["tax_code_display"],
+        "Text (M)": text,
+        "Cost Center (N)": lines["Department"],
+    }
+    totals = lines.groupby(group_no, sort=True)["sap_amount"].sum().round(2)
+    return columns, group_no, totals
+
+
+def report_total_row(amount: float) -> dict:
+    return {
+        "Concur Employee ID": "",
+        "SAP Supplier ID": "",
+        "Report ID": "",
+        "Report Submit Date": "",
+        "Account (I)": "REPORT TOTAL",
+        "Assignment (J)": "",
+        "Amount (K)": amount,
+        "Tax Code": "",
+        "Text (M)": "Report total (validation only)",
+        "Cost Center (N)": "",
+    }
 
 
+def build_sap_view(agg: pd.DataFrame) -> pd.DataFrame:
+    columns, group_no, totals = build_sap_view_columns(agg)
+    if group_no.empty:
+        return pd.DataFrame()
+    details = pd.DataFrame(columns)
+    total_rows = pd.DataFrame([report_total_row(amount) for amount in totals])
+    combined = pd.concat([details, total_rows], ignore_index=True)
+    # A report's lines come first (original order), then its REPORT TOTAL row.
+    group_key = np.concatenate([group_no.to_numpy(), totals.index.to_numpy()])
+    total_last = np.concatenate([np.zeros(len(details)), np.ones(len(total_rows))])
+    return combined.iloc[np.lexsort((total_last, group_key))].reset_index(drop=True)
+
+
+def iter_sap_view_rows(agg: pd.DataFrame) -> Iterable[tuple]:
+    """Yield SAP_Paste rows (header first) in build_sap_view order without building the view frame."""
+    columns, group_no, totals = build_sap_view_columns(agg)
+    if group_no.empty:
+        return
+    yield tuple(SAP_VIEW_COLUMNS)
+    last_in_group = ~group_no.duplicated(keep="last")
+    for values, group, is_last in zip(
+        zip(*(columns[name].tolist() for name in SAP_VIEW_COLUMNS)),
+        group_no.tolist(),
+        last_in_group.tolist(),
+    ):
+        yield values
+        if is_last:
+            total = report_total_row(float(totals[group]))
+            yield tuple(total[name] for name in SAP_VIEW_COLUMNS)
+
+
+def iter_frame_rows(df: pd.DataFrame) -> Iterable[tuple]:
+    """Yield a frame's header and rows as plain tuples, laid out like to_excel(index=False)."""
+    yield tuple(df.columns)
+    yield from df.itertuples(index=False, name=None)
+
+
+def append_rows(worksheet, rows: Iterable[tuple]) -> None:
+    """Append header + data rows to an openpyxl worksheet (normal or write-only), styled like pandas."""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+    thin = Side(style="thin")
+    header_cells = []
+    for value in header:
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.font = Font(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal="center", vertical="top")
+        header_cells.append(cell)
+    worksheet.append(header_cells)
+    for row in rows:
+        worksheet.append(["" if pd.isna(value) else value for value in row])
+
+
+def write_sap_view_stream(writer: pd.ExcelWriter, agg: pd.DataFrame, sheet_name: str = "SAP_Paste") -> None:
+    """Append SAP_Paste rows straight into the writer's openpyxl workbook, styled like pandas headers."""
+    append_rows(writer.book.create_sheet(sheet_name), iter_sap_view_rows(agg))
+
+
+def write_raw_link_sheet(worksheet, source_path: Path, raw_df: pd.DataFrame) -> None:
+    """Point Raw_Input at the source extract instead of copying it into the workbook."""
+    source = source_path.resolve()
+    append_rows(worksheet, [
+        ("Field", "Value"),
+        ("Source file", str(source)),
+        ("Rows", len(raw_df.index)),
+        ("SHA-256", hash_file(source_path)),
+        ("Note", "Raw extract not copied; open the source file for line detail."),
+    ])
+    worksheet["B2"].hyperlink = source.as_uri()
+    worksheet["B2"].style = "Hyperlink"
+
 
 def process_file(
     region: str,
@@ -761,14 +1012,17 @@ def process_file(
     vendor_lookup: dict[str, str],
     employee_lookup: dict[str, str],
     cost_center_transform=None,
+    stream_sap_view: bool = False,
+    raw_sheet: str = "full",
 ) -> tuple[Path, pd.DataFrame]:
-    raw_df = read_concur_file(path)
+    """Convert one extract; raw_sheet (see RAW_SHEET_MODES) controls the Raw_Input sheet."""
+    raw_df = read_concur_file(path, usecols=None if raw_sheet in {"full", "stream"} else CONCUR_COLUMNS)
     raw_df = ensure_mixed_columns(raw_df)
     comp, unmatched_gst = prepare_company_rows(raw_df.copy(), vendor_lookup, employee_lookup, region, cost_center_transform)
     validate_gst_rates(comp, region)
     agg = aggregate_rows(comp)
     agg = apply_region_tax_display(agg, region)
-    sap_view = build_sap_view(agg)
+    sap_view = None if stream_sap_view else build_sap_view(agg)
     gst_check = build_gst_check(agg, unmatched_gst)
     output_dir = OUTPUT_ROOT / region
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -779,74 +1033,303 @@ def process_file(
         except PermissionError:
             timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
             output_path = output_dir / f"SAP_{region}_{path.stem}_{timestamp}.xlsx"
+    summary = agg.rename(columns={
+        "display_account": "Journal Account Code",
+        "sap_account": "SAP GL",
+        "gross_amount": "Journal Amount (Gross)",
+        "net_amount": "Net Amount",
+        "gst_amount": "GST Amount",
+        "SAP Vendor ID": "SAP Supplier ID",
+        "tax_code_display": "Tax Code",
+    })
+    if raw_sheet == "stream":
+        # Write-only workbook: rows go to the sheet XML as they are appended, so
+        # the raw echo never becomes a second in-memory grid of cell objects.
+        workbook = Workbook(write_only=True)
+        append_rows(workbook.create_sheet("Summary"), iter_frame_rows(summary))
+        append_rows(
+            workbook.create_sheet("SAP_Paste"),
+            iter_sap_view_rows(agg) if sap_view is None else iter_frame_rows(sap_view),
+        )
+        if not gst_check.empty:
+            append_rows(workbook.create_sheet("GST_Check"), iter_frame_rows(gst_check))
+        append_rows(workbook.create_sheet("Raw_Input"), iter_frame_rows(raw_df))
+        workbook.save(output_path)
+        return output_path, agg
+
     with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        agg.rename(columns={
-            "display_account": "Journal Account Code",
-            "sap_account": "SAP GL",
-            "gross_amount": "Journal Amount (Gross)",
-            "net_amount": "Net Amount",
-            "gst_amount": "GST Amount",
-            "SAP Vendor ID": "SAP Supplier ID",
-            "tax_code_display": "Tax Code",
-        }).to_excel(writer, sheet_name="Summary", index=False)
-        sap_view.to_excel(writer, sheet_name="SAP_Paste", index=False)
+        summary.to_excel(writer, sheet_name="Summary", index=False)
+        if sap_view is None:
+            write_sap_view_stream(writer, agg)
+        else:
+            sap_view.to_excel(writer, sheet_name="SAP_Paste", index=False)
         if not gst_check.empty:
             gst_check.to_excel(writer, sheet_name="GST_Check", index=False)
-        raw_df.to_excel(writer, sheet_name="Raw_Input", index=False)
+        if raw_sheet == "full":
+            raw_df.to_excel(writer, sheet_name="Raw_Input", index=False)
+        elif raw_sheet == "link":
+            write_raw_link_sheet(writer.book.create_sheet("Raw_Input"), path, raw_df)
     return output_path, agg
 
+def plan_region_files(
+    region_dir: Path, lookup_hash: str, manifest: RunManifest | None = None
+) -> list[tuple[Path, str]]:
+    """Return (path, content hash) for the files that need converting.
+
+    Files sharing a stem write the same SAP_<region>_<stem>.xlsx, so if any of
+    them is new or changed they are all converted again to keep last-wins order.
+    Unchanged files are recorded as skipped on the manifest.
+    """
+    files = list(iter_region_files(region_dir))
+    if manifest is None:
+        return [(file_path, "") for file_path in files]
+    hashes = {file_path: hash_file(file_path) for file_path in files}
+    stale_stems = {
+        file_path.stem.upper()
+        for file_path in files
+        if not manifest.is_current(file_path, hashes[file_path], lookup_hash)
+    }
+    manifest.skipped.extend(file_path for file_path in files if file_path.stem.upper() not in stale_stems)
+    return [(file_path, hashes[file_path]) for file_path in files if file_path.stem.upper() in stale_stems]
+
+
 def process_region(
     region: str,
     region_dir: Path,
     vendor_lookup: dict[str, str],
     employee_lookup: dict[str, str],
     cost_center_transform=None,
+    stream_sap_view: bool = False,
+    manifest: RunManifest | None = None,
+    raw_sheet: str = "full",
+    failures: list[tuple[Path, Exception]] | None = None,
 ) -> list[Path]:
+    """Convert a region's files in order; with a failures list, failed files are recorded there and skipped."""
     outputs: list[Path] = []
-    for file_path in iter_region_files(region_dir):
+    lookup_hash = hash_lookups(vendor_lookup, employee_lookup)
+    for file_path, input_hash in plan_region_files(region_dir, lookup_hash, manifest):
         print(f"[INFO] {region}: transforming {file_path.name}")
-        output_path, _ = process_file(region, file_path, vendor_lookup, employee_lookup, cost_center_transform)
+        try:
+            output_path, _ = process_file(
+                region, file_path, vendor_lookup, employee_lookup, cost_center_transform, stream_sap_view, raw_sheet
+            )
+        except Exception as exc:
+            if failures is None:
+                raise
+            failures.append((file_path, exc))
+            continue
+        outputs.append(output_path)
+        if manifest is not None:
+            manifest.record(file_path, input_hash, lookup_hash, [output_path])
+            manifest.save()
+    return outputs
+
+def load_region_lookups(region_conf: dict, use_cache: bool = True) -> tuple[dict[str, str], dict[str, str]]:
+    """Return (vendor_lookup, employee_lookup) for a region config."""
+    vendor_lookup = load_vendor_lookup(region_conf["vendor_file"], use_cache)
+    emp_map_conf = region_conf.get("employee_map", {})
+    employee_lookup = load_employee_map(emp_map_conf.get("path"), emp_map_conf.get("sheet"), use_cache)
+    return vendor_lookup, employee_lookup
+
+
+_WORKER_LOOKUPS: dict[str, tuple[dict[str, str], dict[str, str]]] = {}
+
+
+def init_worker(lookups: dict[str, tuple[dict[str, str], dict[str, str]]]) -> None:
+    """Process-pool initializer: receive every region's lookups once per worker."""
+    _WORKER_LOOKUPS.update(lookups)
+
+
+def process_files_worker(
+    jobs: list[tuple[str, Path]], stream_sap_view: bool, raw_sheet: str = "full"
+) -> list[Path]:
+    """Convert (region, path) jobs in order inside a worker; jobs sharing an output path arrive together."""
+    outputs: list[Path] = []
+    for region, file_path in jobs:
+        region_conf = next(conf for conf in REGIONS if conf["code"] == region)
+        vendor_lookup, employee_lookup = _WORKER_LOOKUPS[region]
+        print(f"[INFO] {region}: transforming {file_path.name}", flush=True)
+        output_path, _ = process_file(
+            region,
+            file_path,
+            vendor_lookup,
+            employee_lookup,
+            region_conf.get("cost_center_transform"),
+            stream_sap_view,
+            raw_sheet,
+        )
         outputs.append(output_path)
     return outputs
 
-def main() -> int:
+
+def process_regions_parallel(
+    regions_to_process: list[dict],
+    workers: int,
+    stream_sap_view: bool = False,
+    use_cache: bool = True,
+    manifest: RunManifest | None = None,
+    raw_sheet: str = "full",
+) -> tuple[list[Path], list[tuple[Path, Exception]]]:
+    """Convert every file of every region in a process pool.
+
+    Lookups are loaded once per region in the parent and handed to each worker
+    at start-up. Files that would write the same SAP_<region>_<stem>.xlsx run
+    in one task, in the sequential order, so the last one still wins. Outputs
+    are returned in region/file order regardless of completion order.
+    """
+    lookups: dict[str, tuple[dict[str, str], dict[str, str]]] = {}
+    lookup_hashes: dict[str, str] = {}
+    input_hashes: dict[Path, str] = {}
+    chains: dict[tuple[str, str], list[tuple[str, Path]]] = {}
+    ordered_jobs: list[tuple[str, Path]] = []
+    for region_conf in regions_to_process:
+        region_dir = region_conf["data_dir"]
+        if not region_dir.exists():
+            continue
+        region = region_conf["code"]
+        lookups[region] = load_region_lookups(region_conf, use_cache)
+        lookup_hashes[region] = hash_lookups(*lookups[region])
+        for file_path, input_hash in plan_region_files(region_dir, lookup_hashes[region], manifest):
+            input_hashes[file_path] = input_hash
+            chains.setdefault((region, file_path.stem.upper()), []).append((region, file_path))
+            ordered_jobs.append((region, file_path))
+
+    results: dict[Path, Path] = {}
+    failures: dict[Path, Exception] = {}
+    if chains:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(lookups,)) as pool:
+            futures = {
+                pool.submit(process_files_worker, jobs, stream_sap_view, raw_sheet): jobs
+                for jobs in chains.values()
+            }
+            for future in as_completed(futures):
+                jobs = futures[future]
+                try:
+                    outputs = future.result()
+                except Exception as exc:
+                    for _, file_path in jobs:
+                        failures[file_path] = exc
+                    continue
+                for (region, file_path), output_path in zip(jobs, outputs):
+                    results[file_path] = output_path
+                    if manifest is not None:
+                        manifest.record(file_path, input_hashes[file_path], lookup_hashes[region], [output_path])
+                if manifest is not None:
+                    manifest.save()
+
+    generated = [results[file_path] for _, file_path in ordered_jobs if file_path in results]
+    failed = [(file_path, failures[file_path]) for _, file_path in ordered_jobs if file_path in failures]
+    return generated, failed
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert Concur extracts into SAP-ready workbooks.")
+    parser.add_argument("regions", nargs="*", help="Region codes to process (default: all).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Convert files from all regions in a pool of N processes (default: 1, sequential).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Convert every extract even if it is unchanged since the last run.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse vendor/employee workbooks instead of using 03-outputs/lookup-cache.",
+    )
+    parser.add_argument(
+        "--stream-sap-paste",
+        action="store_true",
+        help="Append SAP_Paste rows straight into the workbook instead of building the sheet as a DataFrame.",
+    )
+    parser.add_argument(
+        "--raw-sheet",
+        choices=RAW_SHEET_MODES,
+        default="full",
+        help=(
+            "Raw_Input sheet: full pandas copy (default), stream the copy through a write-only workbook, "
+            "link to the source file (path, rows, SHA-256), or omit it. link/omit read only the columns "
+            "the conversion uses."
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
     if not INPUT_ROOT.exists():
         print(f"Input folder not found: {INPUT_ROOT}")
         return 1
     regions_to_process = []
-    if len(sys.argv) > 1:
-        requested = {arg.upper() for arg in sys.argv[1:]}
+    if args.regions:
+        requested = {arg.upper() for arg in args.regions}
         regions_to_process = [conf for conf in REGIONS if conf["code"].upper() in requested]
     else:
         regions_to_process = REGIONS
 
-    generated: list[Path] = []
-    for region_conf in regions_to_process:
-        region_dir = region_conf["data_dir"]
-        if not region_dir.exists():
-            continue
-        vendor_lookup = load_vendor_lookup(region_conf["vendor_file"])
-        emp_map_conf = region_conf.get("employee_map", {})
-        employee_lookup = load_employee_map(emp_map_conf.get("path"), emp_map_conf.get("sheet"))
-        cost_center_transform = region_conf.get("cost_center_transform")
-        outputs = process_region(
-            region_conf["code"],
-            region_dir,
-            vendor_lookup,
-            employee_lookup,
-            cost_center_transform,
+    # The Raw_Input mode changes the workbook, so it is part of the manifest version.
+    manifest = RunManifest(
+        OUTPUT_ROOT,
+        code_version(
+            Path(__file__), SHARED_DIR / "excel_reader.py", SHARED_DIR / "lookup_builder.py"
+        ) + f"-{args.raw_sheet}",
+        force=args.force,
+    )
+    failures: list[tuple[Path, Exception]] = []
+    if args.workers > 1:
+        generated, failures = process_regions_parallel(
+            regions_to_process,
+            args.workers,
+            args.stream_sap_paste,
+            not args.no_cache,
+            manifest,
+            args.raw_sheet,
         )
-        generated.extend(outputs)
+    else:
+        generated = []
+        for region_conf in regions_to_process:
+            region_dir = region_conf["data_dir"]
+            if not region_dir.exists():
+                continue
+            vendor_lookup, employee_lookup = load_region_lookups(region_conf, not args.no_cache)
+            cost_center_transform = region_conf.get("cost_center_transform")
+            outputs = process_region(
+                region_conf["code"],
+                region_dir,
+                vendor_lookup,
+                employee_lookup,
+                cost_center_transform,
+                args.stream_sap_paste,
+                manifest,
+                args.raw_sheet,
+                failures,
+            )
+            generated.extend(outputs)
+    for file_path, error in failures:
+        print(f"[ERROR] {file_path.name}: {type(error).__name__}: {error}")
+
+    if manifest.skipped:
+        print(f"\nSkipped {len(manifest.skipped)} unchanged extract(s) (use --force to rebuild):")
+        for path in manifest.skipped:
+            print(f"  - {path.relative_to(BASE_DIR)}")
 
     if not generated:
+        if manifest.skipped and not failures:
+            print("No new or changed Concur extracts.")
+            return 0
         print("No Concur extracts were processed.")
         return 1
 
     print("\nCreated the following SAP-formatted files:")
     for path in generated:
         print(f"  - {path.relative_to(BASE_DIR)}")
-    return 0
+    return 1 if failures else 0
 
 if __name__ == "__main__":
     sys.exit(main())
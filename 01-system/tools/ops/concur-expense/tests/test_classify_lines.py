@@ -0,0 +1,88 @@
+"""Differential check: column-wise classify_lines against the row-wise classify_line rules."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import convert_expenses as ce  # noqa: E402
+
+COMPARE_COLS = [
+    ce.MIXED_FLAG_COL,
+    ce.TAXABLE_AMT_COL,
+    ce.NONTAXABLE_AMT_COL,
+    ce.MIXED_TAXABLE_DERIVED_COL,
+    ce.MIXED_NONTAXABLE_DERIVED_COL,
+    ce.MIXED_NOTE_COL,
+    "tax_code",
+]
+
+
+def build_classification_sample(rows: int, region: str, seed: int = 0) -> pd.DataFrame:
+    """Generate expense lines that exercise every classify_line branch (zero, full rate, mixed, fall-through)."""
+    rng = np.random.default_rng(seed)
+    expected_rate = ce.EXPECTED_GST_RATE.get(region.upper(), 0.10)
+    expected_ratio = expected_rate / (1 + expected_rate)
+    gross = rng.choice([-1.0, 1.0], rows) * np.round(rng.uniform(0.0, 5000.0, rows), 2)
+    gross[rng.random(rows) < 0.05] = 0.0
+    kind = rng.integers(0, 5, rows)
+    ratio = np.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3],
+        [
+            0.0,
+            expected_ratio + rng.uniform(-ce.GST_RATE_TOLERANCE, ce.GST_RATE_TOLERANCE, rows),
+            rng.uniform(0.0, expected_ratio - ce.GST_RATE_TOLERANCE, rows),
+            rng.uniform(expected_ratio, 1.5, rows),
+        ],
+        default=rng.uniform(0.0, 1.0, rows),
+    )
+    gst = np.round(gross * ratio, 2)
+    # Near-zero gross with real GST skips the rate checks entirely.
+    tiny = rng.random(rows) < 0.03
+    gross[tiny] = np.round(rng.uniform(0.0, 0.02, tiny.sum()), 2)
+    gst[tiny] = np.round(rng.uniform(0.02, 5.0, tiny.sum()), 2)
+    notes = np.where(rng.random(rows) < 0.2, "Provided note", "")
+    return pd.DataFrame({
+        "gross_amount": gross,
+        "gst_amount": gst,
+        "tax_code": np.where(np.abs(gst) > 0.009, "L1", "L0"),
+        ce.MIXED_FLAG_COL: np.where(rng.random(rows) < 0.1, "y", ""),
+        ce.TAXABLE_AMT_COL: np.where(rng.random(rows) < 0.1, np.round(np.abs(gross) / 2, 2), 0.0),
+        ce.NONTAXABLE_AMT_COL: 0.0,
+        ce.MIXED_NOTE_COL: notes,
+        ce.MIXED_TAXABLE_DERIVED_COL: 0.0,
+        ce.MIXED_NONTAXABLE_DERIVED_COL: 0.0,
+    })
+
+
+def compare_classifiers(df: pd.DataFrame, region: str) -> pd.DataFrame:
+    """Run classify_line and classify_lines on the same frame; return the rows where they disagree."""
+    row_wise = df.apply(lambda row: ce.classify_line(row, region), axis=1)
+    column_wise = ce.classify_lines(df, region)
+    mismatch = pd.Series(False, index=df.index)
+    for col in COMPARE_COLS:
+        left = row_wise[col].astype(object)
+        right = column_wise[col].astype(object)
+        mismatch |= ~((left == right) | (left.isna() & right.isna()))
+    return pd.concat(
+        [row_wise.loc[mismatch, COMPARE_COLS], column_wise.loc[mismatch, COMPARE_COLS]],
+        axis=1,
+        keys=["row_wise", "column_wise"],
+    )
+
+
+@pytest.mark.parametrize("region", sorted(ce.EXPECTED_GST_RATE))
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_classify_lines_matches_classify_line(region: str, seed: int) -> None:
+    diff = compare_classifiers(build_classification_sample(2000, region, seed), region)
+    assert diff.empty, diff.head(10).to_string()
+
+
+def test_classify_lines_leaves_other_regions_untouched() -> None:
+    sample = build_classification_sample(10, "AU")
+    assert ce.classify_lines(sample, "SG") is sample
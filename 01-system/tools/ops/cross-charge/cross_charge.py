@@ -3,23 +3,62 @@ Travel invoice cross-charge extractor.
 
 Reads PDF invoices from the input folder, extracts key fields using regexes,
 and writes a consolidated Excel file.
+
+Usage:
+    python 01-system/tools/ops/cross-charge/cross_charge.py [--workers N] [--no-cache]
+
+--workers N extracts the PDFs in a pool of N processes; rows stay in input order.
+Text comes from the first text backend in TEXT_BACKENDS whose text yields every
+field: the raw pdfium text layer first, pdfplumber's layout analysis as the
+fallback. The Text_Backend column records which one was used.
+Extracted first-page text and parsed records are cached by PDF content hash in
+CACHE_PATH, so unchanged invoices are not re-opened on later runs. --no-cache
+bypasses the cache.
+
+Each record is committed to RUN_STORE_PATH as soon as it is extracted and the
+Excel file is built from that store once every PDF is done; the store is then
+removed. If a run is interrupted (or the workbook is locked), the next run
+resumes from the store and only extracts the remaining PDFs. --restart
+discards a leftover store.
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
+import inspect
+import json
 import logging
 import re
-from dataclasses import dataclass
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, date
+from importlib.metadata import version
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
 import pdfplumber
 
+try:
+    import pypdfium2
+except ImportError:  # pdfplumber only depends on it from 0.10 on
+    pypdfium2 = None
+
 
 INPUT_DIR_PRIMARY = Path("02-inputs/Cross charge list")
 INPUT_DIR_FALLBACK = Path("02-inputs/invoices")
 OUTPUT_PATH = Path("03-outputs/cross charge list/travel_cross_charge.xlsx")
+CACHE_PATH = Path("03-outputs/cross charge list/extraction_cache.sqlite")
+RUN_STORE_PATH = Path("03-outputs/cross charge list/travel_cross_charge.run.sqlite")
+# PDFs queued per worker process; bounds memory and pickling backlog on large runs.
+IN_FLIGHT_PER_WORKER = 2
+# Bump when the cache tables change shape; older caches are rebuilt.
+CACHE_SCHEMA_VERSION = 2
+NUMBER_RE = re.compile(r"([-+]?\d[\d,]*\.?\d*)")
 
 
 @dataclass
@@ -33,6 +72,7 @@ class InvoiceRecord:
     gst_amount: Optional[float]
     net_amount: Optional[float]
     source_file: str
+    text_backend: str = ""
 
 
 def setup_logging() -> None:
@@ -57,102 +97,485 @@ def clean_amount(value: str) -> Optional[float]:
         return None
 
 
-def extract_invoice_number(text: str) -> Optional[str]:
-    """Extract invoice number from 'Tax Invoice - <number>'."""
-    match = re.search(r"Tax\s+Invoice\s*-\s*([A-Za-z0-9.\-]+)", text, flags=re.IGNORECASE)
-    return match.group(1).strip() if match else None
-
-
-def extract_invoice_date(text: str) -> Optional[date]:
-    """Extract issue date and return as date object."""
-    match = re.search(r"Issue\s+Date\s+(\d{1,2}/\d{1,2}/\d{4})", text, flags=re.IGNORECASE)
-    if not match:
-        return None
-    try:
-        return datetime.strptime(match.group(1), "%d/%m/%Y").date()
-    except ValueError:
-        logging.warning("Could not parse invoice date from %s", match.group(1))
-        return None
-
-
-def extract_passenger_name(text: str) -> Optional[str]:
-    """Extract passenger name from the line starting with 'Passenger' or 'Passengers'."""
-    for line in text.splitlines():
-        match = re.match(r"\s*Passengers?:\s*(.+)", line, flags=re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-    return None
-
-
 def _last_number_in_line(line: str) -> Optional[float]:
     """Return the last numeric value in a line, if any."""
-    numbers = re.findall(r"([-+]?\d[\d,]*\.?\d*)", line)
+    numbers = NUMBER_RE.findall(line)
     if not numbers:
         return None
     return clean_amount(numbers[-1])
 
 
-def extract_invoice_total(text: str) -> Optional[float]:
-    """Extract gross invoice total from the 'Invoice Total' line."""
-    for line in text.splitlines():
-        if re.match(r"\s*Invoice\s+Total", line, flags=re.IGNORECASE):
-            amount = _last_number_in_line(line)
-            if amount is not None:
-                return amount
-    return None
+def parse_text(match: re.Match) -> str:
+    return match.group(1).strip()
 
 
-def extract_gst_amount(text: str) -> Optional[float]:
-    """Extract GST amount from a line that contains GST and a single amount."""
-    for line in text.splitlines():
-        match = re.match(r"\s*GST\b[^\d\-]*([-+]?\d[\d,]*\.?\d*)\s*$", line, flags=re.IGNORECASE)
-        if match:
-            return clean_amount(match.group(1))
-    for line in text.splitlines():
-        if "GST" in line:
-            amount = _last_number_in_line(line)
-            if amount is not None:
-                return amount
-    return None
+def parse_date(match: re.Match) -> Optional[date]:
+    try:
+        return datetime.strptime(match.group(1), "%d/%m/%Y").date()
+    except ValueError:
+        logging.warning("Could not parse invoice date from %s", match.group(1))
+        return None
 
 
-def extract_fields(text: str, source_file: str) -> InvoiceRecord:
+def parse_amount(match: re.Match) -> Optional[float]:
+    return clean_amount(match.group(1))
+
+
+def parse_last_number(match: re.Match) -> Optional[float]:
+    return _last_number_in_line(match.string)
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """One way of reading an InvoiceRecord field from the invoice text.
+
+    With scope "line" the pattern is searched in each line (anchor it with ^
+    to match at the start); with scope "text" it is searched in the whole
+    text, so label and value may sit on different lines (e.g. a two-column
+    "Issue Date" / "12/03/2024" layout). The first match settles the rule with
+    parse(match), unless skip_none is set and parse returns None, in which
+    case later matches are tried. Rules for the same field are in priority
+    order: a settled earlier rule beats any later one, wherever it matched.
+    """
+
+    field: str
+    pattern: str
+    parse: Callable[[re.Match], object]
+    flags: int = re.IGNORECASE
+    skip_none: bool = False
+    scope: str = "line"
+
+    def signature(self) -> str:
+        return (
+            f"{self.field}|{self.pattern}|{self.flags}|{self.parse.__name__}|"
+            f"{self.skip_none}|{self.scope}"
+        )
+
+
+# Field rules for the travel-agency invoice layout; add rules here for new layouts.
+FIELD_RULES: Tuple[FieldRule, ...] = (
+    # \s may span line breaks: the label and value can be extracted on separate lines.
+    FieldRule("invoice_number", r"Tax\s+Invoice\s*-\s*([A-Za-z0-9.\-]+)", parse_text, scope="text"),
+    FieldRule("invoice_date", r"Issue\s+Date\s+(\d{1,2}/\d{1,2}/\d{4})", parse_date, scope="text"),
+    FieldRule("passenger_name", r"^\s*Passengers?:\s*(.+)", parse_text),
+    FieldRule("invoice_amount_gross", r"^\s*Invoice\s+Total", parse_last_number, skip_none=True),
+    # A line holding GST and a single amount; otherwise the last number on any GST line.
+    FieldRule("gst_amount", r"^\s*GST\b[^\d\-]*([-+]?\d[\d,]*\.?\d*)\s*$", parse_amount),
+    FieldRule("gst_amount", r"GST", parse_last_number, flags=0, skip_none=True),
+)
+
+
+class FieldExtractor:
+    """Reads every field in one walk over the lines, stopping once all are settled.
+
+    Whole-text rules are searched first (one regex scan each); the line walk
+    then only runs the line rules that could still change a field.
+    """
+
+    def __init__(self, rules: Iterable[FieldRule]) -> None:
+        self.rules = tuple(rules)
+        self.fields = list(dict.fromkeys(rule.field for rule in self.rules))
+        ranks: Dict[str, int] = {}
+        self.compiled = []
+        for rule in self.rules:
+            rank = ranks.get(rule.field, 0)
+            ranks[rule.field] = rank + 1
+            self.compiled.append((re.compile(rule.pattern, rule.flags), rule, rank))
+
+    def extract(self, text: str) -> Dict[str, object]:
+        """Return {field: value} for every field (None when no rule settled it)."""
+        values: Dict[str, object] = dict.fromkeys(self.fields)
+        settled_rank: Dict[str, int] = {}
+        for pattern, rule, rank in self.compiled:
+            if rule.scope != "text" or settled_rank.get(rule.field, rank + 1) < rank:
+                continue
+            for match in pattern.finditer(text):
+                value = rule.parse(match)
+                if value is None and rule.skip_none:
+                    continue
+                values[rule.field] = value
+                settled_rank[rule.field] = rank
+                break
+        active = [
+            entry
+            for entry in self.compiled
+            if entry[1].scope == "line"
+            and (entry[1].field not in settled_rank or entry[2] < settled_rank[entry[1].field])
+        ]
+        if not active:
+            return values
+        for line in text.splitlines():
+            settled = False
+            for pattern, rule, rank in active:
+                match = pattern.search(line)
+                if match is None or (rule.field in settled_rank and settled_rank[rule.field] < rank):
+                    continue
+                value = rule.parse(match)
+                if value is None and rule.skip_none:
+                    continue
+                values[rule.field] = value
+                settled_rank[rule.field] = rank
+                settled = True
+            if settled:
+                # Only rules that could still beat a settled value stay active.
+                active = [
+                    entry
+                    for entry in active
+                    if entry[1].field not in settled_rank or entry[2] < settled_rank[entry[1].field]
+                ]
+                if not active:
+                    break
+        return values
+
+    def signature(self) -> str:
+        return "\n".join(rule.signature() for rule in self.rules)
+
+
+FIELD_EXTRACTOR = FieldExtractor(FIELD_RULES)
+
+
+def extract_fields(text: str, source_file: str, text_backend: str = "") -> InvoiceRecord:
     """Extract all required fields from invoice text."""
-    invoice_number = extract_invoice_number(text)
-    invoice_date = extract_invoice_date(text)
-    passenger_name = extract_passenger_name(text)
-    gross = extract_invoice_total(text)
-    gst = extract_gst_amount(text)
+    values = FIELD_EXTRACTOR.extract(text)
+    gross = values["invoice_amount_gross"]
+    gst = values["gst_amount"]
     net = gross - gst if gross is not None and gst is not None else None
 
     return InvoiceRecord(
-        passenger_name=passenger_name,
-        invoice_number=invoice_number,
-        invoice_date=invoice_date,
+        passenger_name=values["passenger_name"],
+        invoice_number=values["invoice_number"],
+        invoice_date=values["invoice_date"],
         invoice_amount_gross=gross,
         gst_amount=gst,
         net_amount=net,
         source_file=source_file,
+        text_backend=text_backend,
     )
 
 
-def load_text_from_pdf(pdf_path: Path) -> Optional[str]:
-    """Extract text from the first page of a PDF."""
+def pdfium_first_page_text(pdf_path: Path) -> Optional[str]:
+    """Raw text layer of the first page in content order (no layout analysis)."""
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        if len(pdf) == 0:
+            return None
+        page = pdf[0]
+        textpage = page.get_textpage()
+        text = textpage.get_text_range()
+        textpage.close()
+        page.close()
+        return text
+    finally:
+        pdf.close()
+
+
+def pdfplumber_first_page_text(pdf_path: Path) -> Optional[str]:
+    """First-page text through pdfplumber's layout analysis; slow but reading-order aware."""
+    with pdfplumber.open(pdf_path) as pdf:
+        if not pdf.pages:
+            return None
+        return pdf.pages[0].extract_text()
+
+
+# Text backends in the order they are tried; add faster/alternative extractors here.
+TEXT_BACKENDS: Dict[str, Callable[[Path], Optional[str]]] = {}
+if pypdfium2 is not None:
+    TEXT_BACKENDS["pdfium"] = pdfium_first_page_text
+TEXT_BACKENDS["pdfplumber"] = pdfplumber_first_page_text
+TEXT_BACKEND_PACKAGES = {"pdfium": "pypdfium2", "pdfplumber": "pdfplumber"}
+
+
+def load_text_from_pdf(pdf_path: Path, backend: str = "pdfplumber") -> Optional[str]:
+    """Extract text from the first page of a PDF with the given backend."""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            if not pdf.pages:
-                logging.warning("No pages found in %s", pdf_path.name)
-                return None
-            page = pdf.pages[0]
-            text_raw = page.extract_text()
-            if text_raw is None:
-                logging.warning("No text extracted from %s", pdf_path.name)
-                return None
-            return "\n".join(text_raw.splitlines())
+        text_raw = TEXT_BACKENDS[backend](pdf_path)
     except Exception as exc:
-        logging.error("Failed to read %s: %s", pdf_path.name, exc)
+        logging.error("Failed to read %s with %s: %s", pdf_path.name, backend, exc)
+        return None
+    if not text_raw or not text_raw.strip():
+        logging.warning("No text extracted from %s with %s", pdf_path.name, backend)
+        return None
+    return "\n".join(text_raw.splitlines())
+
+
+def extract_invoice(pdf_path: Path) -> Tuple[Optional[str], Optional[InvoiceRecord]]:
+    """Return (text, record) from the first backend whose text yields every field.
+
+    When no backend finds them all, the last backend that produced text wins
+    (pdfplumber, as before the fast backends existed).
+    """
+    text, record = None, None
+    backends = list(TEXT_BACKENDS)
+    for backend in backends:
+        backend_text = load_text_from_pdf(pdf_path, backend)
+        if not backend_text:
+            continue
+        text = backend_text
+        record = extract_fields(text, pdf_path.name, backend)
+        if not has_missing_fields(record):
+            break
+        if backend != backends[-1]:
+            logging.info("Missing fields in %s text of %s; falling back", backend, pdf_path.name)
+    return text, record
+
+
+def source_version(*objects) -> str:
+    """Short hash of the given functions' source (strings are hashed as-is)."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update((obj if isinstance(obj, str) else inspect.getsource(obj)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def text_version() -> str:
+    """Version of the text extraction step (backend releases + loader code)."""
+    releases = "-".join(
+        f"{backend}{version(TEXT_BACKEND_PACKAGES[backend])}" for backend in TEXT_BACKENDS
+    )
+    loaders = source_version(load_text_from_pdf, extract_invoice, *TEXT_BACKENDS.values())
+    return f"{releases}-{loaders}"
+
+
+def fields_version() -> str:
+    """Version of the field regexes/parsers; a change re-parses cached text."""
+    return source_version(
+        InvoiceRecord,
+        clean_amount,
+        _last_number_in_line,
+        FieldExtractor,
+        extract_fields,
+        FIELD_EXTRACTOR.signature(),
+        *dict.fromkeys(rule.parse for rule in FIELD_EXTRACTOR.rules),
+    )
+
+
+def hash_pdf(pdf_path: Path) -> str:
+    return hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+
+
+def record_to_json(record: InvoiceRecord) -> str:
+    data = asdict(record)
+    if record.invoice_date is not None:
+        data["invoice_date"] = record.invoice_date.isoformat()
+    return json.dumps(data)
+
+
+def record_from_json(payload: str) -> InvoiceRecord:
+    data = json.loads(payload)
+    if data["invoice_date"]:
+        data["invoice_date"] = date.fromisoformat(data["invoice_date"])
+    return InvoiceRecord(**data)
+
+
+class ExtractionCache:
+    """SQLite cache of first-page text and parsed records, keyed by PDF content hash.
+
+    Text rows are tied to the text extractor version and record rows to the
+    fields version, so a regex change only re-parses the cached text while a
+    new backend release or loader re-opens the PDFs. Rows from other versions
+    are dropped when the cache is opened.
+    """
+
+    def __init__(self, path: Path, text_version: str, fields_version: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.text_version = text_version
+        self.fields_version = fields_version
+        self.hits = {"record": 0, "text": 0, "miss": 0}
+        with self.conn:
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_SCHEMA_VERSION:
+                self.conn.execute("DROP TABLE IF EXISTS texts")
+                self.conn.execute("DROP TABLE IF EXISTS records")
+                self.conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts (content_hash TEXT, version TEXT, "
+                "backend TEXT, text TEXT, PRIMARY KEY (content_hash, version))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "content_hash TEXT, version TEXT, record TEXT, PRIMARY KEY (content_hash, version))"
+            )
+            self.conn.execute("DELETE FROM texts WHERE version != ?", (text_version,))
+            self.conn.execute("DELETE FROM records WHERE version != ?", (fields_version,))
+
+    def lookup(self, content_hash: str, source_file: str) -> Optional[InvoiceRecord]:
+        """Return the cached record, re-parsing cached text if only the fields changed."""
+        row = self.conn.execute(
+            "SELECT record FROM records WHERE content_hash = ? AND version = ?",
+            (content_hash, self.fields_version),
+        ).fetchone()
+        if row:
+            self.hits["record"] += 1
+            return replace(record_from_json(row[0]), source_file=source_file)
+        row = self.conn.execute(
+            "SELECT backend, text FROM texts WHERE content_hash = ? AND version = ?",
+            (content_hash, self.text_version),
+        ).fetchone()
+        if row:
+            backend, text = row
+            record = extract_fields(text, source_file, backend)
+            # Fast-backend text that no longer yields every field needs the fallback chain.
+            if not has_missing_fields(record) or backend == list(TEXT_BACKENDS)[-1]:
+                self.hits["text"] += 1
+                self.store(content_hash, None, record)
+                return record
+        self.hits["miss"] += 1
         return None
 
+    def store(self, content_hash: str, text: Optional[str], record: InvoiceRecord) -> None:
+        with self.conn:
+            if text is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO texts VALUES (?, ?, ?, ?)",
+                    (content_hash, self.text_version, record.text_backend, text),
+                )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?)",
+                (content_hash, self.fields_version, record_to_json(record)),
+            )
+
+    def close(self) -> None:
+        logging.info(
+            "Extraction cache: %d record(s) reused, %d re-parsed from cached text, %d extracted",
+            self.hits["record"],
+            self.hits["text"],
+            self.hits["miss"],
+        )
+        self.conn.close()
+
+
+class RecordStore:
+    """Append-only SQLite store of this run's records, so an interrupted run can resume.
+
+    Rows are keyed by PDF path together with its size and modification time,
+    so a PDF replaced between runs is extracted again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "source_path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, record TEXT)"
+            )
+
+    @staticmethod
+    def file_key(pdf_path: Path) -> Tuple[str, int, int]:
+        stat = pdf_path.stat()
+        return str(pdf_path), stat.st_size, stat.st_mtime_ns
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM records")
+
+    def load(self, pdf_files: List[Path]) -> Dict[Path, InvoiceRecord]:
+        """Return the stored records that still match the given (unchanged) PDFs."""
+        rows = {
+            (source_path, size, mtime_ns): record
+            for source_path, size, mtime_ns, record in self.conn.execute(
+                "SELECT source_path, size, mtime_ns, record FROM records"
+            )
+        }
+        records = {}
+        for pdf_path in pdf_files:
+            payload = rows.get(self.file_key(pdf_path))
+            if payload is not None:
+                records[pdf_path] = record_from_json(payload)
+        return records
+
+    def append(self, pdf_path: Path, record: InvoiceRecord) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+                (*self.file_key(pdf_path), record_to_json(record)),
+            )
+
+    def discard(self) -> None:
+        """Close and delete the store once its records have been written out."""
+        self.conn.close()
+        self.path.unlink(missing_ok=True)
+
+
+def process_pdf(pdf_path: Path) -> Tuple[Optional[str], Optional[InvoiceRecord], float]:
+    """Extract one invoice; return (text, record, seconds). Both are None when no text was found."""
+    start = time.perf_counter()
+    text, record = extract_invoice(pdf_path)
+    return text, record, time.perf_counter() - start
+
+
+def iter_processed(
+    pdf_files: List[Path], workers: int = 1, cache: Optional[ExtractionCache] = None
+) -> Iterator[Tuple[Path, Optional[InvoiceRecord], float]]:
+    """Yield (pdf_path, record, seconds) for each PDF as it finishes.
+
+    Cached invoices are yielded first without opening the PDF. The rest run
+    inline or, with workers > 1, in a process pool that holds at most
+    workers * IN_FLIGHT_PER_WORKER submitted files at a time; results arrive in
+    completion order and are written back to the cache.
+    """
+    hashes = {}
+    to_extract = []
+    for pdf_path in pdf_files:
+        if cache is None:
+            to_extract.append(pdf_path)
+            continue
+        start = time.perf_counter()
+        hashes[pdf_path] = hash_pdf(pdf_path)
+        record = cache.lookup(hashes[pdf_path], pdf_path.name)
+        if record is None:
+            to_extract.append(pdf_path)
+        else:
+            yield pdf_path, record, time.perf_counter() - start
+
+    for pdf_path, text, record, elapsed in iter_extracted(to_extract, workers):
+        if cache is not None and record is not None:
+            cache.store(hashes[pdf_path], text, record)
+        yield pdf_path, record, elapsed
+
+
+def iter_extracted(
+    pdf_files: List[Path], workers: int = 1
+) -> Iterator[Tuple[Path, Optional[str], Optional[InvoiceRecord], float]]:
+    if workers <= 1:
+        for pdf_path in pdf_files:
+            yield (pdf_path, *process_pdf(pdf_path))
+        return
+
+    pending = iter(pdf_files)
+    with ProcessPoolExecutor(max_workers=workers, initializer=setup_logging) as pool:
+        in_flight = {
+            pool.submit(process_pdf, pdf_path): pdf_path
+            for pdf_path in islice(pending, workers * IN_FLIGHT_PER_WORKER)
+        }
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                pdf_path = in_flight.pop(future)
+                try:
+                    text, record, elapsed = future.result()
+                except Exception as exc:
+                    logging.error("Failed to process %s: %s", pdf_path.name, exc)
+                    text, record, elapsed = None, None, 0.0
+                yield pdf_path, text, record, elapsed
+            for pdf_path in islice(pending, len(done)):
+                in_flight[pool.submit(process_pdf, pdf_path)] = pdf_path
+
+
+def has_missing_fields(record: InvoiceRecord) -> bool:
+    return not all(
+        [
+            record.invoice_number,
+            record.invoice_date,
+            record.passenger_name,
+            record.invoice_amount_gross is not None,
+            record.gst_amount is not None,
+            record.net_amount is not None,
+        ]
+    )
+
 
 def find_input_files() -> List[Path]:
     """Return list of PDF files from primary or fallback directory."""
@@ -181,6 +604,7 @@ def records_to_dataframe(records: Iterable[InvoiceRecord]) -> pd.DataFrame:
             "GST_Amount": r.gst_amount,
             "Net_Amount": r.net_amount,
             "Source_File": r.source_file,
+            "Text_Backend": r.text_backend,
         }
         for r in records
     ]
@@ -193,41 +617,87 @@ def records_to_dataframe(records: Iterable[InvoiceRecord]) -> pd.DataFrame:
     return df
 
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract travel invoice fields into the cross-charge list.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Extract PDFs in a pool of N processes (default: 1, sequential).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-extract every PDF instead of reusing {CACHE_PATH}.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help=f"Discard records left in {RUN_STORE_PATH} by an interrupted run instead of resuming.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Orchestrate PDF extraction and Excel export."""
+    args = parse_args(argv)
     setup_logging()
     pdf_files = find_input_files()
     if not pdf_files:
         logging.warning("No input files to process. Exiting.")
         return
 
-    records: List[InvoiceRecord] = []
-    for pdf_path in pdf_files:
-        text = load_text_from_pdf(pdf_path)
-        if not text:
+    store = RecordStore(RUN_STORE_PATH)
+    if args.restart:
+        store.clear()
+    results = store.load(pdf_files)
+    if results:
+        logging.info(
+            "Resuming interrupted run: %d of %d PDF(s) already extracted in %s",
+            len(results),
+            len(pdf_files),
+            RUN_STORE_PATH,
+        )
+    pending = [pdf_path for pdf_path in pdf_files if pdf_path not in results]
+
+    cache = None if args.no_cache else ExtractionCache(CACHE_PATH, text_version(), fields_version())
+    extracted = 0
+    backends = Counter()
+    start = time.perf_counter()
+    for pdf_path, record, elapsed in iter_processed(pending, args.workers, cache):
+        if record is None:
             logging.warning("Skipping %s due to missing text", pdf_path.name)
             continue
-        record = extract_fields(text, pdf_path.name)
-
-        if not all(
-            [
-                record.invoice_number,
-                record.invoice_date,
-                record.passenger_name,
-                record.invoice_amount_gross is not None,
-                record.gst_amount is not None,
-                record.net_amount is not None,
-            ]
-        ):
+        if has_missing_fields(record):
             logging.warning("Missing fields in %s -> %s", pdf_path.name, record)
 
-        records.append(record)
-        logging.info("Processed %s", pdf_path.name)
+        store.append(pdf_path, record)
+        extracted += 1
+        backends[record.text_backend] += 1
+        logging.info("Processed %s in %.2fs", pdf_path.name, elapsed)
+    total = time.perf_counter() - start
+    logging.info(
+        "Extracted %d of %d PDFs in %.1fs (%.1f files/s, %d worker(s))",
+        extracted,
+        len(pending),
+        total,
+        len(pending) / total if total else 0.0,
+        max(1, args.workers),
+    )
+    logging.info(
+        "Text backends: %s", ", ".join(f"{name} {count}" for name, count in backends.most_common())
+    )
+    if cache is not None:
+        cache.close()
 
+    results = store.load(pdf_files)
+    records = [results[pdf_path] for pdf_path in pdf_files if pdf_path in results]
     df = records_to_dataframe(records)
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     df.to_excel(OUTPUT_PATH, index=False, sheet_name="Invoices", engine="openpyxl")
     logging.info("Wrote %d records to %s", len(df), OUTPUT_PATH)
+    store.discard()
 
 
 if __name__ == "__main__":
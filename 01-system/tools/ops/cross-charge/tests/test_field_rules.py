@@ -0,0 +1,79 @@
+"""FIELD_RULES must read the same values the per-field regex searches did, including across line breaks."""
+
+from __future__ import annotations
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import cross_charge as cc  # noqa: E402
+
+
+def extract(text: str) -> dict:
+    return cc.FIELD_EXTRACTOR.extract(text)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Tax Invoice - INV123", "INV123"),
+        ("Tax Invoice -\nINV123", "INV123"),
+        ("Tax\nInvoice - X9", "X9"),
+        ("Tax Invoice\n- Z1\nTax Invoice - LATER", "Z1"),
+        ("Invoice - X9", None),
+    ],
+)
+def test_invoice_number_across_lines(text: str, expected) -> None:
+    assert extract(text)["invoice_number"] == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Issue Date 12/03/2024", date(2024, 3, 12)),
+        ("Issue Date\n12/03/2024", date(2024, 3, 12)),
+        ("Issue\nDate 1/1/2025", date(2025, 1, 1)),
+        # The first match settles the field even when the date is invalid.
+        ("Issue Date 31/02/2024\nIssue Date 01/03/2024", None),
+        ("Issue Date\nPassengers: MR X", None),
+    ],
+)
+def test_invoice_date_across_lines(text: str, expected) -> None:
+    assert extract(text)["invoice_date"] == expected
+
+
+def test_strict_gst_rule_beats_earlier_loose_line() -> None:
+    text = "Total incl GST 110.00\nGST 10.00\nGST included 5.5 12"
+    assert extract(text)["gst_amount"] == 10.0
+
+
+def test_loose_gst_rule_when_no_strict_line() -> None:
+    text = "Airfare 100.00\nTotal incl GST 110.00\nGST included 5.5 12"
+    assert extract(text)["gst_amount"] == 110.0
+
+
+def test_invoice_total_skips_lines_without_a_number() -> None:
+    fields = extract("Invoice Total\nInvoice Total AUD 1,234.50\nInvoice Total 9")
+    assert fields["invoice_amount_gross"] == 1234.5
+
+
+def test_extract_fields_record() -> None:
+    text = "\n".join([
+        "Tax Invoice -",
+        "INV-42",
+        "Issue Date",
+        "05/06/2025",
+        "Passengers: MR JOHN SMITH",
+        "Invoice Total 550.00",
+        "GST 50.00",
+    ])
+    record = cc.extract_fields(text, "a.pdf", "pdfplumber")
+    assert (record.invoice_number, record.invoice_date, record.passenger_name) == (
+        "INV-42",
+        date(2025, 6, 5),
+        "MR JOHN SMITH",
+    )
+    assert (record.invoice_amount_gross, record.gst_amount, record.net_amount) == (550.0, 50.0, 500.0)
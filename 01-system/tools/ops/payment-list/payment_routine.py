@@ -12,23 +12,54 @@ Steps for each raw workbook:
 2. Ensure Sheet1 contains all raw records plus a SUPPLIER NAME column.
 3. Add Sheet2 with a PivotTable laid out as Supplier -> Vendor -> DD -> Reference
    so overdue items can be filtered directly via the DD field. Supplier totals remain.
+   The pivot parts are written directly into the xlsx; --pivot-engine com builds
+   it through Excel instead.
 
 Usage:
-    python 01-system/tools/ops/payment-list/payment_routine.py
+    python 01-system/tools/ops/payment-list/payment_routine.py [--force] [--no-cache]
+        [--pivot-engine {native,com}] [--workers N]
+
+Inputs already converted with the same content, vendor lookup and script
+version (see 03-outputs/payment-list/manifest.json) are skipped unless --force.
+--workers N builds the workbooks of all regions in a pool of N processes; each
+region's vendor lookup is loaded once in the parent and shared with the workers.
 """
 
 from __future__ import annotations
 
+import argparse
+import codecs
 import ctypes
-import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain, islice
 from pathlib import Path
 import tempfile
+from typing import Iterable, Iterator
 
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 from openpyxl.utils import get_column_letter
-import win32com.client as win32
+
+SHARED_DIR = Path(__file__).resolve().parents[1] / "_shared"
+sys.path.insert(0, str(SHARED_DIR))
+from excel_pool import ExcelPool  # noqa: E402
+from excel_reader import frame_from_rows, iter_sheet_rows, read_excel, select_engine  # noqa: E402
+from lookup_builder import build_lookup, int_ids, stripped_text  # noqa: E402
+from lookup_cache import cached_lookup  # noqa: E402
+from run_manifest import RunManifest, code_version, hash_file, hash_lookups  # noqa: E402
+from sap_headers import (  # noqa: E402
+    SAP_HEADERS,
+    HeaderSynonyms,
+    find_header_row,
+    is_header_line,
+    normalize_columns,
+)
+from xlsx_pivot import PivotLayout, build_pivot, pivot_sheet_rows, save_with_pivot  # noqa: E402
 
 BASE_DIR = Path(__file__).resolve().parents[4]
 ONEDRIVE_VENDOR_PATH = (
@@ -44,6 +75,7 @@ REGIONS = [
     {
         "code": "AU",
         "data_dir": INPUT_ROOT / "AU",
+        "headers": SAP_HEADERS,
         "vendor_sources": [
             {
                 "path": ONEDRIVE_VENDOR_PATH,
@@ -61,6 +93,7 @@ REGIONS = [
     {
         "code": "NZ",
         "data_dir": INPUT_ROOT / "NZ",
+        "headers": SAP_HEADERS,
         "vendor_sources": [
             {
                 "path": ONEDRIVE_VENDOR_PATH,
@@ -78,123 +111,31 @@ REGIONS = [
 ]
 
 
+# First bytes of a binary BIFF (.xls) workbook and of a zipped .xlsx saved as .xls.
+OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_SIGNATURE = b"PK\x03\x04"
+TEXT_ENCODINGS = ("utf-8-sig", "cp1252")
+TEXT_CHUNK_SIZE = 1 << 20
+# Leading rows/lines sniffed for the header and text-list layout before the
+# rest of the export is read from the same open iterator.
+PREVIEW_ROWS = 200
+
 REQUIRED_COLUMNS = {
     "Vendor",
     "Reference",
     "DD",
     "Amount in local cur.",
 }
-
-
-def normalize_header_cell(value: object) -> str:
-    text = str(value).strip()
-    text = re.sub(r"\s+", " ", text)
-    return text.lower()
-
-
-def find_header_row(preview: pd.DataFrame) -> int:
-    """Find the first row that looks like the SAP export header."""
-    header_synonyms = {
-        "vendor": {"vendor"},
-        "reference": {"reference", "inv. ref.", "inv ref"},
-        "dd": {"dd", "net due dt", "due date"},
-        "amount": {
-            "amount in local cur.",
-            "amount in local cur",
-            "amount in local currency",
-            "lc amnt",
-        },
-    }
-    for idx, row in preview.iterrows():
-        cells = {
-            normalize_header_cell(v)
-            for v in row.values.tolist()
-            if pd.notna(v)
-        }
-        if "vendor" not in cells:
-            continue
-        matches = sum(1 for synonyms in header_synonyms.values() if cells & synonyms)
-        if matches >= 2:
-            return int(idx)
-    return 0
-
-
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Strip/rename SAP columns to the canonical names used by the pivot."""
-    cleaned = []
-    for col in df.columns:
-        name = str(col).strip() if col is not None else ""
-        name = re.sub(r"\s+", " ", name)
-        cleaned.append(name)
-    df.columns = cleaned
-
-    rename_map: dict[str, str] = {}
-    for col in df.columns:
-        key = normalize_header_cell(col)
-        if key in {"dd", "net due dt", "due date"}:
-            rename_map[col] = "DD"
-        elif key in {
-            "amount in local cur.",
-            "amount in local cur",
-            "amount in local currency",
-            "lc amnt",
-        }:
-            rename_map[col] = "Amount in local cur."
-        elif key in {"inv. ref.", "inv ref"} and "Reference" not in df.columns:
-            rename_map[col] = "Reference"
-        elif key == "vendor":
-            rename_map[col] = "Vendor"
-        elif key == "reference":
-            rename_map[col] = "Reference"
-
-    df = df.rename(columns=rename_map)
-    df = df.loc[
-        :,
-        [
-            c
-            for c in df.columns
-            if c and not normalize_header_cell(c).startswith("unnamed")
-        ],
-    ]
-    df = coalesce_duplicate_columns(
-        df,
-        "DD",
-        invalid_values={"dd", " dd", "DD", " DD", ""},
-    )
-    df = coalesce_duplicate_columns(df, "Reference")
-    df = coalesce_duplicate_columns(df, "Amount in local cur.")
-    return df
-
-
-def coalesce_duplicate_columns(
-    df: pd.DataFrame, base_name: str, invalid_values: set[str] | None = None
-) -> pd.DataFrame:
-    """Collapse duplicate columns like DD/DD.1 into a single base_name column."""
-    positions = [
-        i
-        for i, col in enumerate(df.columns)
-        if col == base_name or str(col).startswith(f"{base_name}.")
-    ]
-    if len(positions) <= 1:
-        return df
-
-    best_pos = positions[0]
-    best_score = -1
-    for pos in positions:
-        series = df.iloc[:, pos]
-        score = int(series.notna().sum())
-        if invalid_values:
-            lowered = series.astype(str).str.lower().str.strip()
-            score -= int(lowered.isin(invalid_values).sum())
-        if score > best_score:
-            best_score = score
-            best_pos = pos
-
-    best_series = df.iloc[:, best_pos]
-    insert_at = min(positions)
-    df = df.drop(df.columns[positions], axis=1)
-    df.insert(insert_at, base_name, best_series)
-    return df
+PIVOT_NAME = "PaymentPivot"
+PIVOT_ROW_FIELDS = ["SUPPLIER NAME", "Vendor", "DD", "Reference"]
+PIVOT_DATA_FIELD = "Amount in local cur."
+PIVOT_ENGINES = ("native", "com")
+# COM operations (pivots, .xls conversions) per Excel instance before it is replaced.
+EXCEL_MAX_OPS = 25
+# One lazily started Excel per process; a --workers pool runs at most N.
+EXCEL_POOL = ExcelPool(size=1, max_ops=EXCEL_MAX_OPS)
+# pandas' ExcelWriter default for datetime columns, kept for Sheet1.
+SHEET1_DATETIME_FORMAT = "YYYY-MM-DD HH:MM:SS"
 
 
 def looks_like_ascii_export(preview: pd.DataFrame) -> bool:
@@ -205,102 +146,279 @@ def looks_like_ascii_export(preview: pd.DataFrame) -> bool:
     return bool(col.str.contains(r"\|").any())
 
 
-def parse_ascii_export(lines: list[str]) -> pd.DataFrame:
-    """Parse a SAP text list export into a structured DataFrame."""
-    header_idx = None
-    for i, line in enumerate(lines):
-        lower = line.lower()
-        if "|" in line and "vendor" in lower and "reference" in lower:
-            header_idx = i
+def split_ascii_line(line: str) -> list[str]:
+    """Split one '| a | b |' text-list line into stripped cells."""
+    return [part.strip() for part in line.strip().strip("|").split("|")]
+
+
+def is_ascii_header(line: str, headers: HeaderSynonyms = SAP_HEADERS) -> bool:
+    # Cheap anchor search first so only candidate lines are split and scored.
+    if "|" not in line or not headers.anchor_pattern.search(line):
+        return False
+    return is_header_line(split_ascii_line(line), headers)
+
+
+def parse_ascii_export(
+    lines: Iterable[str], headers: HeaderSynonyms = SAP_HEADERS
+) -> pd.DataFrame:
+    """Parse a SAP text list export into a structured DataFrame.
+
+    Lines are consumed lazily: the header is detected once, every later data
+    line is split straight into per-column buffers, and the header/separator
+    lines SAP repeats at each page break are skipped. Only the parsed cells are
+    held in memory, never the raw lines.
+    """
+    lines = iter(lines)
+    columns = None
+    for line in lines:
+        if is_ascii_header(line, headers):
+            header_line = line.strip()
+            columns = [c for c in split_ascii_line(line) if c]
             break
-    if header_idx is None:
+    if columns is None:
         raise ValueError("Could not find header row in text-list export.")
 
-    header_line = lines[header_idx].strip()
-    columns = [c.strip() for c in header_line.strip("|").split("|")]
-    columns = [c for c in columns if c]
-
-    rows: list[list[str]] = []
-    for line in lines[header_idx + 1 :]:
+    buffers: list[list[str]] = [[] for _ in columns]
+    width = len(columns)
+    for line in lines:
         stripped = line.strip()
         if not stripped.startswith("|"):
             continue
-        if "vendor" in stripped.lower() and "reference" in stripped.lower():
+        if stripped == header_line or is_ascii_header(stripped, headers):
             continue
         if set(stripped) <= {"-", "|"}:
             continue
-        parts = [p.strip() for p in stripped.strip("|").split("|")]
-        if len(parts) < len(columns):
-            parts += [""] * (len(columns) - len(parts))
-        if len(parts) > len(columns):
-            parts = parts[: len(columns)]
-        rows.append(parts)
-
-    if not rows:
+        parts = split_ascii_line(stripped)
+        for buffer, value in zip(buffers, parts):
+            buffer.append(value)
+        for buffer in buffers[len(parts) : width]:
+            buffer.append("")
+
+    if not buffers[0]:
         raise ValueError("No data rows found in text-list export.")
-    return pd.DataFrame(rows, columns=columns)
+    df = pd.DataFrame(dict(enumerate(buffers)))
+    df.columns = columns
+    return df
+
+
+def parse_amount_value(val):
+    """Convert one SAP amount like '341,199.00-' to a float (None when unparseable)."""
+    if pd.isna(val):
+        return None
+    if isinstance(val, (int, float)):
+        return float(val)
+    text = str(val).strip().replace(",", "").replace(" ", "")
+    if not text:
+        return None
+    negative = text.endswith("-")
+    if negative:
+        text = text[:-1]
+    try:
+        num = float(text)
+    except ValueError:
+        return None
+    return -num if negative else num
+
+
+def float_or_nan(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
 
 
 def parse_amount_series(series: pd.Series) -> pd.Series:
-    """Convert SAP amount strings like '341,199.00-' to floats."""
-    def to_number(val):
-        if pd.isna(val):
-            return None
-        if isinstance(val, (int, float)):
-            return float(val)
-        text = str(val).strip().replace(",", "").replace(" ", "")
-        if not text:
-            return None
-        negative = text.endswith("-")
-        if negative:
-            text = text[:-1]
+    """Convert SAP amount strings like '341,199.00-' to floats without a per-cell Python call.
+
+    Numeric columns are cast directly. Text cells are joined into one buffer,
+    separators and spaces are removed and trailing minus signs are located
+    with numpy, and the cleaned lines are converted in a single cast. Only
+    lines float() rejects go through parse_amount_value one at a time.
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64")
+
+    values = series.to_numpy(dtype=object)
+    result = np.full(len(values), np.nan)
+    present = np.flatnonzero(pd.notna(values))
+    texts = list(map(str, values[present]))
+    buffer = "\n".join(texts).replace(",", "").replace(" ", "").encode("utf-8", "surrogatepass")
+    raw = np.frombuffer(buffer + b"\n", dtype=np.uint8)
+    ends = np.flatnonzero(raw == ord("\n"))
+    if len(ends) != len(texts):
+        # A cell contains a line break; parse everything per cell.
+        fallback = present
+    else:
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        negative = (ends > starts) & (raw[np.maximum(ends - 1, 0)] == ord("-"))
+        keep = np.ones(len(raw) - 1, dtype=bool)
+        keep[ends[negative] - 1] = False
+        lines = np.array(
+            raw[:-1][keep].tobytes().decode("utf-8", "surrogatepass").split("\n"), dtype=object
+        )
+        empty = ends - starts - negative == 0
+        lines[empty] = "nan"
         try:
-            num = float(text)
+            numbers = lines.astype("float64")
+            failed = np.zeros(len(lines), dtype=bool)
         except ValueError:
-            return None
-        return -num if negative else num
-
-    return series.apply(to_number)
+            numbers = np.fromiter(map(float_or_nan, lines), dtype="float64", count=len(lines))
+            failed = np.isnan(numbers) & ~empty
+        numbers[negative] *= -1
+        result[present] = numbers
+        fallback = present[failed]
+    if len(fallback):
+        result[fallback] = pd.to_numeric(
+            pd.Series(values[fallback], dtype=object).map(parse_amount_value), errors="coerce"
+        ).to_numpy(dtype="float64")
+    return pd.Series(result, index=series.index)
+
+
+def sniff_xls_kind(data_path: Path) -> str:
+    """Return 'biff', 'xlsx' or 'text' from the first bytes of an .xls export."""
+    with data_path.open("rb") as handle:
+        head = handle.read(8)
+    if head.startswith(OLE2_SIGNATURE):
+        return "biff"
+    if head.startswith(ZIP_SIGNATURE):
+        return "xlsx"
+    return "text"
+
+
+def detect_text_encoding(data_path: Path) -> str:
+    """Pick the text export's encoding: UTF-16 when it has a BOM, else UTF-8 or cp1252.
+
+    The candidates are validated chunk by chunk so large exports are never
+    decoded into memory in one piece.
+    """
+    with data_path.open("rb") as handle:
+        if handle.read(2) in (b"\xff\xfe", b"\xfe\xff"):
+            return "utf-16"
+        for encoding in TEXT_ENCODINGS:
+            handle.seek(0)
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                for chunk in iter(lambda: handle.read(TEXT_CHUNK_SIZE), b""):
+                    decoder.decode(chunk)
+                decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                continue
+            return encoding
+    return "latin-1"
+
+
+def iter_text_lines(data_path: Path) -> Iterator[str]:
+    """Yield a SAP text export's lines one at a time."""
+    encoding = detect_text_encoding(data_path)
+    with data_path.open(encoding=encoding) as handle:
+        for line in handle:
+            yield line.rstrip("\r\n")
+
+
+def first_column_lines(rows: Iterable[tuple]) -> Iterator[str]:
+    """Yield the non-empty first-column cells of a text list pasted into a workbook."""
+    for row in rows:
+        if row and row[0] != "":
+            yield str(row[0])
+
+
+def parse_tab_export(
+    lines: Iterable[str], headers: HeaderSynonyms = SAP_HEADERS
+) -> pd.DataFrame:
+    """Parse a tab-delimited SAP spreadsheet export saved with an .xls name."""
+    rows = [line.split("\t") for line in lines]
+    width = max((len(row) for row in rows), default=0)
+    if width <= 1:
+        raise ValueError("Text export is neither pipe- nor tab-delimited.")
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    preview = pd.DataFrame(rows[:PREVIEW_ROWS]).replace("", None)
+    header_row = find_header_row(preview, headers)
+    columns = [cell.strip() for cell in rows[header_row]]
+    df = pd.DataFrame(rows[header_row + 1 :], columns=columns)
+    return df.apply(lambda col: col.str.strip()).replace("", None)
+
+
+def parse_text_export(
+    lines: Iterable[str], headers: HeaderSynonyms = SAP_HEADERS
+) -> pd.DataFrame:
+    """Parse an .xls export that is really text: a pipe text list or tab-delimited rows."""
+    lines = iter(lines)
+    head = list(islice(lines, PREVIEW_ROWS))
+    if any(line.lstrip().startswith("|") for line in head):
+        return parse_ascii_export(chain(head, lines), headers)
+    return parse_tab_export(chain(head, lines), headers)
 
 
-def load_raw_dataframe(data_path: Path) -> pd.DataFrame:
-    """Load a SAP export (.xlsx or .xls) with header/column normalization."""
-    temp_path: Path | None = None
-    readable_path = data_path
-    if data_path.suffix.lower() == ".xls":
-        excel = win32.DispatchEx("Excel.Application")
-        excel.Visible = False
-        excel.DisplayAlerts = False
+def convert_xls_with_excel(data_path: Path) -> Path:
+    """Save an .xls as a temporary .xlsx through Excel COM; the caller deletes it."""
+    with EXCEL_POOL.operation("convert", data_path.name) as excel:
         wb = excel.Workbooks.Open(str(data_path))
         try:
             tmp_file = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
             temp_path = Path(tmp_file.name)
             tmp_file.close()
             wb.SaveAs(str(temp_path), FileFormat=51)
-            readable_path = temp_path
+            return temp_path
         finally:
             wb.Close(SaveChanges=False)
-            excel.Quit()
 
+
+def read_export_frame(
+    readable_path: Path, headers: HeaderSynonyms = SAP_HEADERS, engine: str | None = None
+) -> pd.DataFrame:
+    """Read a workbook export in one pass, detecting text-list payloads and the header row.
+
+    The first PREVIEW_ROWS rows are sniffed for the layout and header, then the
+    same sheet iterator carries on with the rest, so the workbook is opened and
+    parsed exactly once. engine defaults to the one preferred for the suffix.
+    """
+    start = time.perf_counter()
+    rows = iter_sheet_rows(readable_path, engine)
+    head = list(islice(rows, PREVIEW_ROWS))
+    preview = frame_from_rows(head, header=None)
+    if looks_like_ascii_export(preview):
+        df = parse_ascii_export(first_column_lines(chain(head, rows)), headers)
+    else:
+        header_row = find_header_row(preview, headers)
+        df = frame_from_rows(chain(head[header_row:], rows))
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] Read {readable_path.name} in one pass in {elapsed:.2f}s")
+    return df
+
+
+def read_xls_export(data_path: Path, headers: HeaderSynonyms = SAP_HEADERS) -> pd.DataFrame:
+    """Read an .xls export natively; Excel COM conversion is the last resort."""
     try:
-        preview = pd.read_excel(readable_path, header=None, nrows=200)
-        if looks_like_ascii_export(preview):
-            raw_lines = (
-                pd.read_excel(readable_path, header=None)
-                .iloc[:, 0]
-                .dropna()
-                .astype(str)
-                .tolist()
-            )
-            df = parse_ascii_export(raw_lines)
-        else:
-            header_row = find_header_row(preview)
-            df = pd.read_excel(readable_path, header=header_row)
+        kind = sniff_xls_kind(data_path)
+        if kind == "text":
+            print(f"[INFO] {data_path.name} is a text export saved as .xls; parsing directly")
+            return parse_text_export(iter_text_lines(data_path), headers)
+        if kind == "xlsx":
+            print(f"[INFO] {data_path.name} is an xlsx workbook saved as .xls; reading it as xlsx")
+        engine = select_engine(data_path, ".xlsx" if kind == "xlsx" else ".xls")
+        return read_export_frame(data_path, headers, engine)
+    except Exception as exc:
+        native_error = exc
+
+    print(f"[WARN] Native .xls read failed for {data_path.name} ({native_error}); converting through Excel")
+    try:
+        temp_path = convert_xls_with_excel(data_path)
+    except ImportError:
+        raise native_error
+    try:
+        return read_export_frame(temp_path, headers)
     finally:
-        if temp_path and temp_path.exists():
-            temp_path.unlink(missing_ok=True)
+        temp_path.unlink(missing_ok=True)
+
+
+def load_raw_dataframe(data_path: Path, headers: HeaderSynonyms = SAP_HEADERS) -> pd.DataFrame:
+    """Load a SAP export (.xlsx or .xls) with header/column normalization."""
+    if data_path.suffix.lower() == ".xls":
+        df = read_xls_export(data_path, headers)
+    else:
+        df = read_export_frame(data_path, headers)
 
-    df = normalize_columns(df)
+    df = normalize_columns(df, headers)
     df = df.dropna(how="all")
     if "Vendor" in df.columns:
         df = df[df["Vendor"].notna()]
@@ -324,7 +442,32 @@ def copy_with_winapi(src: Path, dst: Path) -> None:
         raise ctypes.WinError()
 
 
-def load_vendor_lookup(vendor_sources: list[dict]) -> dict[int, str]:
+def read_vendor_source(
+    path: Path, sheet, usecols, copy_for_read: bool = False
+) -> dict[int, str]:
+    """Parse one vendor workbook into {vendor_id: supplier_name}."""
+    temp_path: Path | None = None
+    target_path = path
+    try:
+        if copy_for_read:
+            temp_file = tempfile.NamedTemporaryFile(suffix=path.suffix, delete=False)
+            temp_path = Path(temp_file.name)
+            temp_file.close()
+            copy_with_winapi(path, temp_path)
+            target_path = temp_path
+
+        df = read_excel(target_path, sheet_name=sheet, usecols=usecols)
+        lookup, stats = build_lookup(df.iloc[:, 0], df.iloc[:, 1], int_ids, stripped_text)
+        print(f"[INFO] Vendor source {path.name}: {stats.describe()}")
+        return lookup
+    finally:
+        if temp_path and temp_path.exists():
+            temp_path.unlink(missing_ok=True)
+
+
+def load_vendor_lookup(
+    vendor_sources: list[dict], use_cache: bool = True
+) -> dict[int, str]:
     """Return {vendor_id: supplier_name} using the first available vendor source."""
     last_error: Exception | None = None
     for source in vendor_sources:
@@ -336,38 +479,21 @@ def load_vendor_lookup(vendor_sources: list[dict]) -> dict[int, str]:
             print(f"[WARN] Vendor source missing: {path}")
             continue
 
-        temp_path: Path | None = None
-        target_path = path
         try:
-            if copy_for_read:
-                temp_file = tempfile.NamedTemporaryFile(
-                    suffix=path.suffix, delete=False
-                )
-                temp_path = Path(temp_file.name)
-                temp_file.close()
-                copy_with_winapi(path, temp_path)
-                target_path = temp_path
-
-            df = pd.read_excel(target_path, sheet_name=sheet, usecols=usecols)
-            df = df.dropna()
-            lookup: dict[int, str] = {}
-            for _, row in df.iterrows():
-                try:
-                    vendor_id = int(row.iloc[0])
-                except (TypeError, ValueError):
-                    continue
-                name = str(row.iloc[1]).strip()
-                if name:
-                    lookup[vendor_id] = name
+            lookup = cached_lookup(
+                "payment-vendor",
+                path,
+                lambda: read_vendor_source(path, sheet, usecols, copy_for_read),
+                sheet=sheet,
+                usecols=usecols,
+                enabled=use_cache,
+            )
             if lookup:
                 print(f"[INFO] Vendor source loaded: {path}")
                 return lookup
         except Exception as exc:  # pragma: no cover - defensive logging
             last_error = exc
             print(f"[WARN] Failed vendor source {path}: {exc}")
-        finally:
-            if temp_path and temp_path.exists():
-                temp_path.unlink(missing_ok=True)
 
     if last_error:
         raise last_error
@@ -403,23 +529,73 @@ def ensure_supplier_column(df: pd.DataFrame, lookup: dict[int, str]) -> pd.DataF
     return df
 
 
-def write_base_workbook(df: pd.DataFrame, output_path: Path) -> tuple[int, int]:
-    """Write Sheet1 with raw data + supplier names; return (row_count, col_count)."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Sheet1", index=False)
+def header_cells(worksheet, columns) -> list[WriteOnlyCell]:
+    """pandas-style header row (bold, thin border, centered)."""
+    thin = Side(style="thin")
+    cells = []
+    for name in columns:
+        cell = WriteOnlyCell(worksheet, value=str(name))
+        cell.font = Font(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal="center", vertical="top")
+        cells.append(cell)
+    return cells
+
 
-    wb = load_workbook(output_path)
-    for sheet_name in list(wb.sheetnames):
-        if sheet_name != "Sheet1":
-            del wb[sheet_name]
+def frame_rows(worksheet, df: pd.DataFrame):
+    """Yield df's rows as worksheet.append rows; datetimes get pandas' default format."""
+    date_columns = {
+        pos for pos, dtype in enumerate(df.dtypes) if pd.api.types.is_datetime64_any_dtype(dtype)
+    }
+    for values in df.itertuples(index=False, name=None):
+        row = []
+        for pos, value in enumerate(values):
+            if pos in date_columns or isinstance(value, pd.Timestamp):
+                if pd.isna(value):
+                    row.append(None)
+                    continue
+                cell = WriteOnlyCell(worksheet, value=pd.Timestamp(value).to_pydatetime())
+                cell.number_format = SHEET1_DATETIME_FORMAT
+                row.append(cell)
+            elif value is None or (isinstance(value, float) and value != value):
+                row.append(None)
+            else:
+                row.append(value)
+        yield row
+
+
+def write_base_workbook(
+    df: pd.DataFrame, output_path: Path, pivot: PivotLayout | None = None
+) -> tuple[int, int]:
+    """Write Sheet1 (raw data + supplier names) and Sheet2 in one streaming save.
+
+    When a native pivot layout is given, its cells and pivot parts are
+    written in the same save. Returns (row_count, col_count) of the Sheet1
+    range.
+    """
+    start = time.perf_counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    wb = Workbook(write_only=True)
+    ws_data = wb.create_sheet("Sheet1")
+    ws_data.append(header_cells(ws_data, df.columns))
+    for row in frame_rows(ws_data, df):
+        ws_data.append(row)
 
     ws_summary = wb.create_sheet("Sheet2")
-    ws_summary["A1"] = "Payment pivot (DD visible in rows for manual screening)"
-    ws_summary[
-        "A2"
-    ] = "Filter DD entries or collapse totals to focus on overdue vs not due items."
-    wb.save(output_path)
+    ws_summary.append(["Payment pivot (DD visible in rows for manual screening)"])
+    ws_summary.append(["Filter DD entries or collapse totals to focus on overdue vs not due items."])
+    if pivot is not None:
+        ws_summary.append([])
+        for row in pivot_sheet_rows(ws_summary, pivot):
+            ws_summary.append(row)
+    if pivot is None:
+        wb.save(output_path)
+    else:
+        save_with_pivot(wb, output_path, "Sheet2", pivot)
+    elapsed = time.perf_counter() - start
+    print(
+        f"[INFO] Wrote {output_path.name}: {output_path.stat().st_size:,} bytes in {elapsed:.2f}s"
+    )
     return len(df.index) + 1, len(df.columns)
 
 
@@ -434,65 +610,81 @@ def add_pivot_table(output_path: Path, last_row: int, last_col: int) -> None:
     xl_tabular_row = 1
     xl_pivot_version = 6
 
-    excel = win32.DispatchEx("Excel.Application")
-    excel.Visible = False
-    excel.DisplayAlerts = False
-    workbook = excel.Workbooks.Open(str(output_path))
-    try:
-        ws_pivot = workbook.Worksheets("Sheet2")
-        ws_pivot.Cells.Clear()
-        ws_pivot.Range("A1").Value = (
-            "Payment pivot (DD visible in rows for manual screening)"
-        )
-        ws_pivot.Range("A2").Value = (
-            "Filter DD entries or collapse totals to focus on overdue items."
-        )
+    with EXCEL_POOL.operation("pivot", output_path.name) as excel:
+        workbook = excel.Workbooks.Open(str(output_path))
+        try:
+            ws_pivot = workbook.Worksheets("Sheet2")
+            ws_pivot.Cells.Clear()
+            ws_pivot.Range("A1").Value = (
+                "Payment pivot (DD visible in rows for manual screening)"
+            )
+            ws_pivot.Range("A2").Value = (
+                "Filter DD entries or collapse totals to focus on overdue items."
+            )
 
-        pivot_cache = workbook.PivotCaches().Create(
-            SourceType=xl_database,
-            SourceData=source_range,
-            Version=xl_pivot_version,
-        )
-        pivot_table = pivot_cache.CreatePivotTable(
-            TableDestination=ws_pivot.Range("A4"), TableName="PaymentPivot"
-        )
+            pivot_cache = workbook.PivotCaches().Create(
+                SourceType=xl_database,
+                SourceData=source_range,
+                Version=xl_pivot_version,
+            )
+            pivot_table = pivot_cache.CreatePivotTable(
+                TableDestination=ws_pivot.Range("A4"), TableName="PaymentPivot"
+            )
 
-        supplier_field = pivot_table.PivotFields("SUPPLIER NAME")
-        supplier_field.Orientation = xl_row_field
-        supplier_field.Position = 1
-        supplier_field.Subtotals = [True] + [False] * 11
-
-        vendor_field = pivot_table.PivotFields("Vendor")
-        vendor_field.Orientation = xl_row_field
-        vendor_field.Position = 2
-        vendor_field.Subtotals = [False] * 12
-
-        dd_field = pivot_table.PivotFields("DD")
-        dd_field.Orientation = xl_row_field
-        dd_field.Position = 3
-        dd_field.Subtotals = [False] * 12
-
-        reference_field = pivot_table.PivotFields("Reference")
-        reference_field.Orientation = xl_row_field
-        reference_field.Position = 4
-        reference_field.Subtotals = [False] * 12
-
-        data_field = pivot_table.AddDataField(
-            pivot_table.PivotFields("Amount in local cur."),
-            "Sum of Amount in local cur.",
-            xl_sum,
-        )
-        data_field.NumberFormat = "#,##0.00"
+            supplier_field = pivot_table.PivotFields("SUPPLIER NAME")
+            supplier_field.Orientation = xl_row_field
+            supplier_field.Position = 1
+            supplier_field.Subtotals = [True] + [False] * 11
+
+            vendor_field = pivot_table.PivotFields("Vendor")
+            vendor_field.Orientation = xl_row_field
+            vendor_field.Position = 2
+            vendor_field.Subtotals = [False] * 12
+
+            dd_field = pivot_table.PivotFields("DD")
+            dd_field.Orientation = xl_row_field
+            dd_field.Position = 3
+            dd_field.Subtotals = [False] * 12
+
+            reference_field = pivot_table.PivotFields("Reference")
+            reference_field.Orientation = xl_row_field
+            reference_field.Position = 4
+            reference_field.Subtotals = [False] * 12
+
+            data_field = pivot_table.AddDataField(
+                pivot_table.PivotFields("Amount in local cur."),
+                "Sum of Amount in local cur.",
+                xl_sum,
+            )
+            data_field.NumberFormat = "#,##0.00"
 
-        pivot_table.RowAxisLayout(xl_tabular_row)
-    finally:
-        workbook.Close(SaveChanges=True)
-        excel.Quit()
+            pivot_table.RowAxisLayout(xl_tabular_row)
+        finally:
+            workbook.Close(SaveChanges=True)
+
+
+def build_payment_pivot(df: pd.DataFrame) -> PivotLayout:
+    """Lay out the PaymentPivot (same fields as add_pivot_table) for the native writer."""
+    return build_pivot(
+        df,
+        PIVOT_ROW_FIELDS,
+        PIVOT_DATA_FIELD,
+        PIVOT_NAME,
+        source_sheet="Sheet1",
+        anchor="A4",
+        data_caption=f"Sum of {PIVOT_DATA_FIELD}",
+    )
 
 
-def process_workbook(region_code: str, data_path: Path, lookup: dict[int, str]) -> Path:
+def process_workbook(
+    region_code: str,
+    data_path: Path,
+    lookup: dict[int, str],
+    pivot_engine: str = "native",
+    headers: HeaderSynonyms = SAP_HEADERS,
+) -> Path:
     """Create the payment workbook for a single region/input file."""
-    df = load_raw_dataframe(data_path)
+    df = load_raw_dataframe(data_path, headers)
     df = ensure_supplier_column(df, lookup)
 
     output_path = (
@@ -500,49 +692,258 @@ def process_workbook(region_code: str, data_path: Path, lookup: dict[int, str])
         / region_code
         / f"PMT_{region_code}_{data_path.stem}.xlsx"
     )
-    last_row, last_col = write_base_workbook(df, output_path)
-    add_pivot_table(output_path, last_row, last_col)
+    if pivot_engine == "com":
+        last_row, last_col = write_base_workbook(df, output_path)
+        add_pivot_table(output_path, last_row, last_col)
+        return output_path
+
+    write_base_workbook(df, output_path, build_payment_pivot(df))
     return output_path
 
 
-def process_region(region_config: dict[str, object]) -> list[Path]:
-    """Process all XLSX files for a region; return list of generated paths."""
+def plan_region_workbooks(
+    region_config: dict[str, object],
+    lookup_hash: str,
+    manifest: RunManifest | None = None,
+) -> list[tuple[Path, str]]:
+    """Return (workbook, input_hash) pairs to regenerate for a region, in run order.
+
+    Unchanged workbooks are added to manifest.skipped.
+    """
+    data_dir = region_config["data_dir"]
+    workbooks = [
+        *data_dir.glob("*.xlsx"),
+        *data_dir.glob("*.xls"),
+    ]
+    workbooks = sorted([w for w in workbooks if not w.name.startswith("~$")])
+    hashes = {w: hash_file(w) if manifest else "" for w in workbooks}
+    # .xls/.xlsx exports sharing a stem write the same PMT file; rerun them together.
+    stale_stems = {
+        w.stem.upper()
+        for w in workbooks
+        if not manifest or not manifest.is_current(w, hashes[w], lookup_hash)
+    }
+    planned: list[tuple[Path, str]] = []
+    for workbook in workbooks:
+        if workbook.stem.upper() not in stale_stems:
+            manifest.skipped.append(workbook)
+            continue
+        planned.append((workbook, hashes[workbook]))
+    return planned
+
+
+def process_region(
+    region_config: dict[str, object],
+    use_cache: bool = True,
+    manifest: RunManifest | None = None,
+    pivot_engine: str = "native",
+    failures: list[tuple[Path, Exception]] | None = None,
+) -> list[Path]:
+    """Process all XLSX files for a region; return list of generated paths.
+
+    With a failures list, failed workbooks are recorded there and skipped.
+    """
     region_code = region_config["code"]
     data_dir = region_config["data_dir"]
     vendor_sources = region_config["vendor_sources"]
+    headers = region_config.get("headers", SAP_HEADERS)
 
     if not data_dir.exists():
         print(f"[WARN] Data directory missing for {region_code}: {data_dir}")
         return []
 
-    lookup = load_vendor_lookup(vendor_sources)
+    lookup = load_vendor_lookup(vendor_sources, use_cache)
     generated_paths: list[Path] = []
-    workbooks = [
-        *data_dir.glob("*.xlsx"),
-        *data_dir.glob("*.xls"),
-    ]
-    for workbook in sorted(
-        [w for w in workbooks if not w.name.startswith("~$")]
-    ):
+    lookup_hash = hash_lookups(lookup)
+    for workbook, input_hash in plan_region_workbooks(region_config, lookup_hash, manifest):
         print(f"[INFO] Generating payment list for {region_code}: {workbook.name}")
-        output_path = process_workbook(region_code, workbook, lookup)
+        try:
+            output_path = process_workbook(
+                region_code, workbook, lookup, pivot_engine, headers
+            )
+        except Exception as exc:
+            if failures is None:
+                raise
+            failures.append((workbook, exc))
+            continue
         generated_paths.append(output_path)
+        if manifest:
+            manifest.record(workbook, input_hash, lookup_hash, [output_path])
+            manifest.save()
     return generated_paths
 
 
-def main() -> int:
+_WORKER_LOOKUPS: dict[str, dict[int, str]] = {}
+
+
+def init_worker(lookups: dict[str, dict[int, str]]) -> None:
+    """Process-pool initializer: receive every region's vendor lookup once per worker."""
+    _WORKER_LOOKUPS.update(lookups)
+
+
+def process_workbooks_worker(jobs: list[tuple[str, Path]], pivot_engine: str) -> list[Path]:
+    """Build (region, workbook) jobs in order inside a worker; jobs sharing a PMT file arrive together."""
+    outputs: list[Path] = []
+    for region_code, workbook in jobs:
+        region_config = next(conf for conf in REGIONS if conf["code"] == region_code)
+        print(f"[INFO] Generating payment list for {region_code}: {workbook.name}", flush=True)
+        output_path = process_workbook(
+            region_code,
+            workbook,
+            _WORKER_LOOKUPS[region_code],
+            pivot_engine,
+            region_config.get("headers", SAP_HEADERS),
+        )
+        outputs.append(output_path)
+    return outputs
+
+
+def process_regions_parallel(
+    regions: list[dict],
+    workers: int,
+    use_cache: bool = True,
+    manifest: RunManifest | None = None,
+    pivot_engine: str = "native",
+) -> tuple[list[Path], list[tuple[Path, Exception]]]:
+    """Build every region's payment workbooks in a process pool.
+
+    Vendor lookups are loaded once per region in the parent and handed to each
+    worker at start-up. Exports that write the same PMT_<region>_<stem>.xlsx
+    run in one task, in the sequential order, so the last one still wins. Any
+    COM step reuses its worker's Excel instance (see EXCEL_POOL). Outputs are
+    returned in region/file order regardless of completion order.
+    """
+    lookups: dict[str, dict[int, str]] = {}
+    lookup_hashes: dict[str, str] = {}
+    input_hashes: dict[Path, str] = {}
+    chains: dict[tuple[str, str], list[tuple[str, Path]]] = {}
+    ordered_jobs: list[tuple[str, Path]] = []
+    for region_config in regions:
+        region_code = region_config["code"]
+        if not region_config["data_dir"].exists():
+            print(f"[WARN] Data directory missing for {region_code}: {region_config['data_dir']}")
+            continue
+        lookups[region_code] = load_vendor_lookup(region_config["vendor_sources"], use_cache)
+        lookup_hashes[region_code] = hash_lookups(lookups[region_code])
+        for workbook, input_hash in plan_region_workbooks(
+            region_config, lookup_hashes[region_code], manifest
+        ):
+            input_hashes[workbook] = input_hash
+            chains.setdefault((region_code, workbook.stem.upper()), []).append((region_code, workbook))
+            ordered_jobs.append((region_code, workbook))
+
+    results: dict[Path, Path] = {}
+    failures: dict[Path, Exception] = {}
+    if chains:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(lookups,)) as pool:
+            futures = {
+                pool.submit(process_workbooks_worker, jobs, pivot_engine): jobs
+                for jobs in chains.values()
+            }
+            for future in as_completed(futures):
+                jobs = futures[future]
+                try:
+                    outputs = future.result()
+                except Exception as exc:
+                    for _, workbook in jobs:
+                        failures[workbook] = exc
+                    continue
+                for (region_code, workbook), output_path in zip(jobs, outputs):
+                    results[workbook] = output_path
+                    if manifest is not None:
+                        manifest.record(
+                            workbook, input_hashes[workbook], lookup_hashes[region_code], [output_path]
+                        )
+                if manifest is not None:
+                    manifest.save()
+
+    generated = [results[w] for _, w in ordered_jobs if w in results]
+    failed = [(w, failures[w]) for _, w in ordered_jobs if w in failures]
+    return generated, failed
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate AU/NZ payment-list workbooks.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every payment workbook even if its SAP export is unchanged.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse vendor workbooks instead of using 03-outputs/lookup-cache.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Build payment workbooks from all regions in a pool of N processes (default: 1, sequential).",
+    )
+    parser.add_argument(
+        "--pivot-engine",
+        choices=PIVOT_ENGINES,
+        default="native",
+        help="Write the Sheet2 pivot directly into the xlsx (default) or build it through Excel COM.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
+    manifest = RunManifest(
+        OUTPUT_ROOT,
+        code_version(
+            Path(__file__),
+            SHARED_DIR / "excel_reader.py",
+            SHARED_DIR / "lookup_builder.py",
+            SHARED_DIR / "sap_headers.py",
+            SHARED_DIR / "xlsx_pivot.py",
+        ) + f"-{args.pivot_engine}",
+        force=args.force,
+    )
     all_outputs: list[Path] = []
-    for region in REGIONS:
-        outputs = process_region(region)
-        all_outputs.extend(outputs)
+    failures: list[tuple[Path, Exception]] = []
+    if args.workers > 1:
+        all_outputs, failures = process_regions_parallel(
+            REGIONS,
+            args.workers,
+            use_cache=not args.no_cache,
+            manifest=manifest,
+            pivot_engine=args.pivot_engine,
+        )
+    else:
+        for region in REGIONS:
+            outputs = process_region(
+                region,
+                use_cache=not args.no_cache,
+                manifest=manifest,
+                pivot_engine=args.pivot_engine,
+                failures=failures,
+            )
+            all_outputs.extend(outputs)
+    EXCEL_POOL.close()
+    for workbook, error in failures:
+        print(f"[ERROR] {workbook.name}: {type(error).__name__}: {error}")
+    if manifest.skipped:
+        print(
+            f"\nSkipped {len(manifest.skipped)} unchanged SAP export(s)"
+            " (use --force to rebuild):"
+        )
+        for path in manifest.skipped:
+            print(f"  - {path.relative_to(BASE_DIR)}")
     if not all_outputs:
+        if manifest.skipped and not failures:
+            print("No new or changed SAP exports.")
+            return 0
         print("No payment workbooks were generated.")
         return 1
     print("\nCreated the following payment workbooks:")
     for path in all_outputs:
         print(f"  - {path.relative_to(BASE_DIR)}")
-    return 0
+    return 1 if failures else 0
 
 
 if __name__ == "__main__":
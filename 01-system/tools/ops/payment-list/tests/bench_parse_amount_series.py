@@ -0,0 +1,39 @@
+"""Time parse_amount_series against the per-cell parser on generated SAP amounts.
+
+Usage: python 01-system/tools/ops/payment-list/tests/bench_parse_amount_series.py [ROWS]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from test_parse_amount_series import build_amount_samples, pr  # noqa: E402
+
+
+def best_of(parser, sample, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(sample)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    rows = int(argv[0]) if argv else 200_000
+    for label, sample in build_amount_samples(rows).items():
+        per_cell = best_of(lambda series: series.apply(pr.parse_amount_value), sample, 3)
+        vectorized = best_of(pr.parse_amount_series, sample, 3)
+        print(
+            f"[INFO] {label}: {rows:,} rows, per-cell {per_cell:.3f}s, "
+            f"vectorized {vectorized:.3f}s ({per_cell / max(vectorized, 1e-9):.1f}x)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Differential check: column-wise parse_amount_series against the per-cell parse_amount_value."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import payment_routine as pr  # noqa: E402
+
+JUNK = ["1.5e3", "n/a", "-", "12-34", "+7.25-", "-3-", ".5", "1,2,3.4", "\t9-\t", "True", "１２"]
+
+
+def build_amount_samples(rows: int, seed: int = 0) -> dict[str, pd.Series]:
+    """Generate FBL1N-style amount columns: clean text, text with blanks/junk, and numeric cells."""
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.uniform(0, 2_000_000, rows), 2)
+    negative = rng.random(rows) < 0.4
+    clean = pd.Series([f"{value:,.2f}" for value in values], dtype=object)
+    clean[negative] = clean[negative] + "-"
+
+    mixed = clean.copy()
+    kind = rng.random(rows)
+    mixed[kind < 0.05] = ""
+    mixed[(kind >= 0.05) & (kind < 0.08)] = None
+    padded = (kind >= 0.08) & (kind < 0.15)
+    mixed[padded] = "  " + mixed[padded] + " "
+    numeric = (kind >= 0.15) & (kind < 0.2)
+    mixed[numeric] = values[numeric]
+    odd = np.flatnonzero((kind >= 0.2) & (kind < 0.21))
+    mixed[odd] = [JUNK[i % len(JUNK)] for i in range(len(odd))]
+
+    return {
+        "text-list amounts": clean,
+        "text with blanks/junk": mixed,
+        "numeric cells": pd.Series(np.where(negative, -values, values)),
+    }
+
+
+def per_cell(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series.apply(pr.parse_amount_value), errors="coerce").to_numpy(dtype="float64")
+
+
+def assert_same(series: pd.Series) -> None:
+    expected = per_cell(series)
+    result = pr.parse_amount_series(series)
+    actual = result.to_numpy(dtype="float64")
+    same = (expected == actual) | (np.isnan(expected) & np.isnan(actual))
+    mismatch = np.flatnonzero(~same)
+    assert not len(mismatch), [
+        (series.iloc[pos], expected[pos], actual[pos]) for pos in mismatch[:10]
+    ]
+    assert result.index.equals(series.index)
+
+
+@pytest.mark.parametrize("label", ["text-list amounts", "text with blanks/junk", "numeric cells"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_parse_amount_series_matches_parse_amount_value(label: str, seed: int) -> None:
+    assert_same(build_amount_samples(5000, seed)[label])
+
+
+@pytest.mark.parametrize(
+    "cells, expected",
+    [
+        (["341,199.00-", "1,234.50", "0.00-"], [-341199.0, 1234.5, -0.0]),
+        (["", "   ", None, "-"], [np.nan] * 4),
+        (["n/a", "12-34", "1.5e3", " 7 -"], [np.nan, np.nan, 1500.0, -7.0]),
+        ([12, 3.5, "4-", np.nan], [12.0, 3.5, -4.0, np.nan]),
+    ],
+)
+def test_parse_amount_series_cases(cells: list, expected: list) -> None:
+    series = pd.Series(cells, dtype=object)
+    np.testing.assert_array_equal(pr.parse_amount_series(series).to_numpy(), expected)
+    assert_same(series)
+
+
+@pytest.mark.parametrize("dtype", ["str", object])
+def test_parse_amount_series_text_dtypes(dtype) -> None:
+    series = pd.Series(["1,000.00-", "", "x", " 2 "], dtype=dtype, index=[5, 6, 7, 8])
+    assert_same(series)
+
+
+def test_parse_amount_series_cell_with_line_break() -> None:
+    assert_same(pd.Series(["1\n2", "3-", "4"], dtype=object))
+
+
+def test_parse_amount_series_numeric_and_bool_columns() -> None:
+    assert_same(pd.Series([1, -2, 3], dtype="int64"))
+    assert_same(pd.Series([1.5, np.nan], dtype="float64"))
+    assert_same(pd.Series([True, False]))